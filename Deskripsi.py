@@ -1,13 +1,4 @@
 import streamlit as st
-import pandas as pd
-import numpy as np
-import pickle
-import os
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
-from statsmodels.tsa.stattools import adfuller
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
-from statsmodels.tsa.statespace.sarimax import SARIMAXResults
 
 # Sidebar informasi
 with st.sidebar:
@@ -1,10 +1,10 @@
 import streamlit as st
-import pickle
+import numpy as np
 import pandas as pd
+from forecasting import artifacts, export, ingest
 
-# Load model SARIMA
-with open('modelsarima.pkl', 'rb') as f:
-    model = pickle.load(f)
+# Model SARIMA dimuat saat Predict diklik, bukan saat aplikasi dijalankan
+MODEL_FILES = ["modelsarima2023", "modelsarima2022"]
 
 st.set_page_config(
     page_title="Multipage App",
@@ -12,11 +12,12 @@ st.set_page_config(
 )
 
 # File uploader
-uploaded_file = st.file_uploader("Upload Excel file to include in prediction", type=["xlsx"])
+uploaded_file = st.file_uploader("Upload Excel file to include in prediction", type=ingest.UPLOAD_TYPES)
 
+input_data = None
 if uploaded_file:
     # Read the Excel file
-    input_data = pd.read_excel(uploaded_file)
+    input_data = ingest.load_frame(uploaded_file)
     st.write("Uploaded Data:")
     st.dataframe(input_data)
 
@@ -24,30 +25,29 @@ if uploaded_file:
 st.title("Forecasting with SARIMA")
 input_periods = st.number_input("Forecast Periods:", min_value=1, max_value=100, value=10)
 
-        # Run prediction
+# Run prediction
 if st.button("Predict"):
-            try:
-                # Generate forecast
-                forecast = model.forecast(steps=input_periods)
-                forecast_index = pd.date_range(start=input_data.index[-1], periods=input_periods + 1, freq='M')[1:]
-                forecast_df = pd.DataFrame({'Date': forecast_index, 'Forecast': forecast})
-
-                st.write("Forecast Results:")
-                st.line_chart(forecast_df.set_index('Date'))
-                
-                # Save forecast to Excel
-                output_filename = 'forecast_results.xlsx'
-                forecast_df.to_excel(output_filename, index=False)
-                
-                with open(output_filename, 'rb') as output_file:
-                    st.download_button(
-                        label="Download Forecast Results",
-                        data=output_file,
-                        file_name=output_filename,
-                        mime='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-                    )
-
-            except Exception as e:
-                st.error(f"Error during prediction: {e}")
-else:
-        st.error("Uploaded file must contain a 'Date' column and a 'Value' column.")
+    try:
+        model_file = next((path for path in MODEL_FILES if artifacts.model_exists(path)), None)
+        if model_file is None:
+            st.error(f"No SARIMA model found ({', '.join(MODEL_FILES)}).")
+            st.stop()
+        model = artifacts.load_model(model_file)
+
+        # Generate forecast (model dilatih pada skala log, seperti di halaman Peramalan Total)
+        forecast = np.expm1(model.forecast(steps=input_periods))
+        if input_data is not None and {"Tanggal", "Jumlah"}.issubset(input_data.columns):
+            last_date = ingest.load_frame(uploaded_file, "total").index[-1]
+        else:
+            last_date = model.last_date
+        forecast_index = pd.date_range(start=last_date, periods=input_periods + 1, freq=pd.offsets.MonthEnd())[1:]
+        forecast_df = pd.DataFrame({'Date': forecast_index, 'Forecast': forecast.to_numpy()})
+
+        st.write("Forecast Results:")
+        st.line_chart(forecast_df.set_index('Date'))
+
+        # Export forecast (in memory, generated on click)
+        export.download_buttons(forecast_df, 'forecast_results')
+
+    except Exception as e:
+        st.error(f"Error during prediction: {e}")
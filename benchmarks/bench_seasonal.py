@@ -0,0 +1,54 @@
+"""Compare the s=52 SARIMA product spec with the Fourier + ARMA weekly mode.
+
+For each synthetic weekly series the last 52 weeks are held out; both
+engines are fitted on the rest and scored on the hold-out.
+
+    python -m benchmarks.bench_seasonal --series 5 --years 4
+"""
+
+import argparse
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks import synthetic
+from forecasting import models
+
+
+def score(actual, forecast):
+    actual, forecast = np.asarray(actual, float), np.asarray(forecast, float)
+    nonzero = actual != 0
+    mape = np.mean(np.abs((actual[nonzero] - forecast[nonzero]) / actual[nonzero])) * 100
+    rmse = np.sqrt(np.mean((actual - forecast) ** 2))
+    return mape, rmse
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--series", type=int, default=3)
+    parser.add_argument("--years", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    rows = []
+    for seed in range(args.series):
+        series = synthetic.weekly_series(args.years * 52, seed)
+        train, test = series.iloc[:-52], series.iloc[-52:]
+        for engine, forecaster in models.FORECASTERS.items():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                start = time.perf_counter()
+                result = forecaster((f"seri {seed}", train, 52))
+                elapsed = time.perf_counter() - start
+            mape, rmse = score(test, result["forecast"])
+            rows.append({"engine": engine, "seri": seed, "fit_detik": elapsed, "MAPE": mape, "RMSE": rmse})
+
+    table = pd.DataFrame(rows)
+    print(table.to_string(index=False, float_format="{:,.3f}".format))
+    print()
+    print(table.groupby("engine")[["fit_detik", "MAPE", "RMSE"]].mean().to_string(float_format="{:,.3f}".format))
+
+
+if __name__ == "__main__":
+    main()
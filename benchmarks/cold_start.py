@@ -0,0 +1,81 @@
+"""Cold-start time of each Streamlit page.
+
+Every page is run once, without an upload, in a fresh interpreter through
+Streamlit's ``AppTest``; the time of that first script run (the page's own
+imports included, Streamlit itself excluded) is what a user waits for after a
+process start before the page is usable:
+
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --budget 1.0      # fail when a page is slower
+
+The report also shows whether the run imported statsmodels or matplotlib,
+which should only happen once a page actually needs them.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PAGES = ["Deskripsi.py", "app.py", "pages/Peramalan Total.py", "pages/Peramalan Produk.py"]
+HEAVY = ("statsmodels", "matplotlib")
+
+_PROBE = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+app = AppTest.from_file(sys.argv[1], default_timeout=120)
+started = time.perf_counter()
+app.run()
+seconds = time.perf_counter() - started
+print(json.dumps({
+    "seconds": seconds,
+    "exceptions": [str(e.value) for e in app.exception],
+    "heavy": sorted({name.split(".")[0] for name in sys.modules} & set(sys.argv[2:])),
+}))
+"""
+
+
+def measure(page, repeat=3):
+    runs = []
+    for _ in range(repeat):
+        out = subprocess.run(
+            [sys.executable, "-c", _PROBE, page, *HEAVY],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+    return {
+        "page": page,
+        "seconds": statistics.median(run["seconds"] for run in runs),
+        "heavy": runs[-1]["heavy"],
+        "exceptions": runs[-1]["exceptions"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Waktu cold start tiap halaman Streamlit.")
+    parser.add_argument("pages", nargs="*", default=PAGES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=None, help="Batas detik per halaman.")
+    args = parser.parse_args(argv)
+
+    print(f"{'page':<30}{'seconds':>10}  imported")
+    over_budget = []
+    for page in args.pages:
+        row = measure(page, args.repeat)
+        print(f"{page:<30}{row['seconds']:>10.3f}  {', '.join(row['heavy']) or '-'}")
+        for message in row["exceptions"]:
+            print(f"  exception: {message}")
+        if args.budget is not None and row["seconds"] > args.budget:
+            over_budget.append(page)
+
+    if over_budget:
+        print(f"\nMelebihi batas {args.budget:.2f} detik: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Stage-by-stage benchmark of the forecasting pipeline on synthetic data.
+
+Every stage is timed separately with its peak traced memory and throughput:
+
+    python -m benchmarks.run --products 30 --years 2
+    python -m benchmarks.run --save-baseline          # write benchmarks/baseline.json (committed)
+    python -m benchmarks.run --compare                # fail on regressions vs the baseline
+
+A stage regresses when it is slower than ``--tolerance`` times its baseline
+(and more than 50 ms slower, to ignore noise on tiny stages).  Timings are
+taken under ``tracemalloc``, which slows allocation-heavy stages such as the
+Excel parse, so only compare them with baselines produced by this suite.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import warnings
+from pathlib import Path
+
+from benchmarks import synthetic
+from forecasting import correlogram, cube, ingest, models, screening
+
+BASELINE = Path(__file__).with_name("baseline.json")
+NOISE_SECONDS = 0.05
+WORKLOAD = ("products", "years", "zero_fraction", "seasonality", "fit_products", "workers", "seed")
+
+
+class Stages:
+    """Collects ``(seconds, peak MB, items/s)`` for each named stage."""
+
+    def __init__(self):
+        self.rows = []
+
+    def run(self, name, fn, items=1, unit="item"):
+        tracemalloc.start()
+        started = time.perf_counter()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            result = fn()
+        seconds = time.perf_counter() - started
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        self.rows.append({
+            "stage": name,
+            "seconds": seconds,
+            "peak_mb": peak / 2 ** 20,
+            "throughput": items / seconds if seconds else float("inf"),
+            "unit": f"{unit}/s",
+        })
+        return result
+
+    def report(self):
+        print(f"{'stage':<22}{'seconds':>10}{'peak MB':>10}{'throughput':>16}")
+        for row in self.rows:
+            print(f"{row['stage']:<22}{row['seconds']:>10.3f}{row['peak_mb']:>10.1f}"
+                  f"{row['throughput']:>12,.1f} {row['unit']}")
+
+
+def _figures(history, forecast):
+    import plotly.express as px
+
+    fig = px.line(title="Prediksi", template="plotly_white")
+    fig.add_scatter(x=history.index, y=history.values, mode="lines+markers", name="Data Aktual")
+    fig.add_scatter(x=forecast.index, y=forecast.values, mode="lines+markers", name="Prediksi SARIMA")
+    return [fig, px.bar(x=forecast.index, y=forecast.values), px.area(x=forecast.index, y=forecast.values)]
+
+
+def run_suite(args):
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    stages = Stages()
+    df = synthetic.transactions(args.products, args.years, args.zero_fraction, args.seasonality, seed=args.seed)
+    data = synthetic.to_xlsx(df)
+    n_rows = len(df)
+    print(f"{n_rows:,} transaksi, {args.products} produk, {args.years} tahun, file {len(data) / 2 ** 20:.1f} MB\n")
+
+    raw = stages.run("excel_parse", lambda: ingest.read_upload(data), n_rows, "rows")
+    products_df = stages.run("clean_products", lambda: ingest.clean_products(raw), n_rows, "rows")
+    total_df = stages.run("clean_total", lambda: ingest.clean_total(raw), n_rows, "rows")
+    data_cube = stages.run("aggregate_cube", lambda: cube.AggregateCube(products_df), n_rows, "rows")
+    weekly = data_cube.matrix("W")
+
+    adf_pass, _, _ = stages.run(
+        "adf_screening", lambda: screening.screen_products(weekly, max_workers=args.workers), len(weekly), "series"
+    )
+    picked = adf_pass[:args.fit_products] or list(weekly.products[:args.fit_products])
+
+    stages.run("acf_pacf", lambda: correlogram.correlograms(
+        [weekly.series(product) for product in weekly.products], nlags=40
+    ), len(weekly), "series")
+
+    total_fit = stages.run("fit_total", lambda: SARIMAX(
+        total_df["Jumlah_Log"].to_numpy(), order=(1, 1, 1), seasonal_order=(1, 1, 1, 12),
+        enforce_stationarity=False, enforce_invertibility=False).fit(disp=False), 1, "fits")
+    stages.run("forecast_total", lambda: total_fit.get_forecast(steps=60).predicted_mean, 60, "steps")
+
+    def fit_products():
+        return [SARIMAX(weekly.series(product), order=models.PRODUCT_ORDER,
+                        seasonal_order=models.PRODUCT_SEASONAL_ORDER,
+                        enforce_stationarity=False, enforce_invertibility=False).fit(disp=False)
+                for product in picked]
+
+    product_fits = stages.run("fit_product", fit_products, len(picked), "fits")
+    forecasts = stages.run("forecast_product", lambda: [
+        fit.get_forecast(steps=models.PRODUCT_STEPS).predicted_mean for fit in product_fits
+    ], len(picked) * models.PRODUCT_STEPS, "steps")
+    stages.run("figures", lambda: [
+        _figures(weekly.series(product), forecast) for product, forecast in zip(picked, forecasts)
+    ], len(picked) * 3, "figs")
+
+    stages.report()
+    return stages.rows
+
+
+def compare(rows, baseline, tolerance):
+    reference = {row["stage"]: row for row in baseline["stages"]}
+    regressions = []
+    for row in rows:
+        ref = reference.get(row["stage"])
+        if ref is None:
+            continue
+        ratio = row["seconds"] / ref["seconds"] if ref["seconds"] else float("inf")
+        if ratio > tolerance and row["seconds"] - ref["seconds"] > NOISE_SECONDS:
+            regressions.append(f"{row['stage']}: {ref['seconds']:.3f}s -> {row['seconds']:.3f}s ({ratio:.1f}x)")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tiap tahap pipeline peramalan.")
+    parser.add_argument("--products", type=int, default=30)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--zero-fraction", type=float, default=0.3, help="Porsi hari tanpa permintaan per produk.")
+    parser.add_argument("--seasonality", type=float, default=0.3, help="Amplitudo relatif siklus tahunan.")
+    parser.add_argument("--fit-products", type=int, default=2, help="Jumlah produk untuk tahap fit SARIMAX.")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument("--compare", action="store_true")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    args = parser.parse_args(argv)
+
+    rows = run_suite(args)
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps({
+            "params": {key: value for key, value in vars(args).items() if key not in ("baseline",)},
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "stages": rows,
+        }, indent=2, default=str))
+        print(f"\nBaseline disimpan ke {args.baseline}")
+
+    if args.compare:
+        if not args.baseline.exists():
+            print(f"\nBaseline {args.baseline} belum ada; jalankan dengan --save-baseline.")
+            return 1
+        baseline = json.loads(args.baseline.read_text())
+        differs = [key for key in WORKLOAD if baseline["params"].get(key) != getattr(args, key)]
+        if differs:
+            print(f"\nPeringatan: parameter berbeda dari baseline ({', '.join(differs)}); waktu tidak sebanding.")
+        regressions = compare(rows, baseline, args.tolerance)
+        if regressions:
+            print("\nRegresi performa:")
+            print("\n".join(f"  {line}" for line in regressions))
+            return 1
+        print("\nTidak ada regresi dibanding baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,66 @@
+"""Synthetic transaction generator for the benchmarks.
+
+Produces frames shaped like the uploads the pages expect: ``Tanggal``,
+``Jumlah`` (formatted with thousands separators, as in the real exports) and
+``Nama Barang`` (with inconsistent case and spacing).
+"""
+
+import io
+
+import numpy as np
+import pandas as pd
+
+WEEKS_PER_YEAR = 365.25 / 7
+
+
+def weekly_series(n_weeks, seed, seasonality=0.3, zero_fraction=0.0):
+    """One weekly demand series with a yearly cycle, AR(1) noise and optional zero weeks."""
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_weeks)
+    level = rng.uniform(50, 500)
+    seasonal = level * seasonality * np.sin(2 * np.pi * t / WEEKS_PER_YEAR + rng.uniform(0, 2 * np.pi))
+    noise = np.zeros(n_weeks)
+    for i in range(1, n_weeks):
+        noise[i] = 0.5 * noise[i - 1] + rng.normal(scale=level * 0.1)
+    values = np.maximum(level + seasonal + noise, 0).round()
+    values[rng.random(n_weeks) < zero_fraction] = 0
+    index = pd.date_range("2019-01-06", periods=n_weeks, freq="W-SUN", name="Tanggal")
+    return pd.Series(values, index=index, name="Jumlah")
+
+
+def transactions(n_products=50, years=3, zero_fraction=0.3, seasonality=0.3, per_day=3, seed=0):
+    """Daily transactions for ``n_products`` over ``years`` years.
+
+    ``zero_fraction`` is the share of product-days without demand (intermittency),
+    ``seasonality`` the relative amplitude of the yearly cycle and ``per_day``
+    the mean number of transactions per product on active days.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2021-01-01", periods=int(years * 365), freq="D")
+    day = np.arange(len(dates))
+    # Popularitas produk mengikuti distribusi Zipf, seperti katalog nyata
+    popularity = 1.0 / np.arange(1, n_products + 1)
+    phase = rng.uniform(0, 2 * np.pi, n_products)
+
+    active = rng.random((n_products, len(dates))) >= zero_fraction
+    rate = per_day * popularity[:, None] * n_products / popularity.sum()
+    rate = rate * (1 + seasonality * np.sin(2 * np.pi * day[None, :] / 365.25 + phase[:, None]))
+    counts = rng.poisson(np.clip(rate, 0, None)) * active
+
+    product_idx, day_idx = np.nonzero(counts)
+    repeats = counts[product_idx, day_idx]
+    product_idx, day_idx = np.repeat(product_idx, repeats), np.repeat(day_idx, repeats)
+    amounts = rng.integers(1, 5000, len(product_idx))
+
+    names = np.array([f"  Barang {i:04d} " if i % 2 else f"BARANG  {i:04d}" for i in range(n_products)])
+    return pd.DataFrame({
+        "Tanggal": dates[day_idx],
+        "Jumlah": [f"{amount:,}".replace(",", ".") for amount in amounts],
+        "Nama Barang": names[product_idx],
+    })
+
+
+def to_xlsx(df):
+    buffer = io.BytesIO()
+    df.to_excel(buffer, index=False)
+    return buffer.getvalue()
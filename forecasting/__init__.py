@@ -0,0 +1 @@
+"""Shared data and modelling layer used by the Streamlit pages."""
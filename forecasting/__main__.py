@@ -0,0 +1,49 @@
+"""Command-line entry points: ``python -m forecasting batch|backtest transactions.xlsx``."""
+
+import argparse
+import sys
+
+from forecasting import backtest, intermittent, models, pipeline
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m forecasting", description="Peramalan permintaan tanpa Streamlit.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    batch = commands.add_parser("batch", help="Ramalkan semua produk yang lolos uji ADF dan total permintaan.")
+    batch.add_argument("path", help="File transaksi (xlsx, csv atau parquet).")
+    batch.add_argument("--out", help="Direktori keluaran (default: .cache/batch/<digest file>).")
+    batch.add_argument("--engine", choices=sorted(models.FORECASTERS), default="sarima")
+    batch.add_argument("--workers", type=int, default=None, help="Jumlah proses worker.")
+    batch.add_argument("--total-model", help="Model tersimpan untuk peramalan total (mis. modelsarima2023).")
+    batch.add_argument("--total-steps", type=int, default=pipeline.TOTAL_STEPS, help="Horizon total (bulan).")
+    batch.add_argument("--product-steps", type=int, default=models.PRODUCT_STEPS, help="Horizon produk (minggu).")
+    batch.add_argument("--intermittent", choices=[*intermittent.METHODS, "none"], default="sba",
+                       help="Metode untuk produk yang tidak lolos uji ADF atau datanya kurang.")
+
+    check = commands.add_parser("backtest", help="Akurasi rolling-origin (MAPE/RMSE/MASE per horizon).")
+    check.add_argument("path", help="File transaksi (xlsx, csv atau parquet).")
+    check.add_argument("--model", action="append", default=[], help="Model total tersimpan (boleh berulang).")
+    check.add_argument("--products", action="store_true", help="Backtest juga produk yang lolos uji ADF.")
+    check.add_argument("--horizon", type=int, default=backtest.HORIZON, help="Langkah ke depan per titik awal.")
+    check.add_argument("--workers", type=int, default=None, help="Jumlah proses worker.")
+    check.add_argument("--out", help="Simpan metrik per horizon ke file CSV.")
+
+    args = parser.parse_args(argv)
+    if args.command == "batch":
+        pipeline.run_batch(args.path, args.out, args.engine, args.workers, args.total_model,
+                           args.total_steps, args.product_steps,
+                           intermittent_method=None if args.intermittent == "none" else args.intermittent)
+    elif args.command == "backtest":
+        metrics, errors = pipeline.run_backtest(args.path, args.model, args.horizon, args.products, args.workers)
+        if len(metrics):
+            print(metrics.groupby("Model", sort=False)[list(backtest.METRICS)].mean().round(3).to_string())
+        for _, row in errors.iterrows():
+            print(f"Gagal: {row['Model']}: {row['error']}")
+        if args.out:
+            metrics.to_csv(args.out, index=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
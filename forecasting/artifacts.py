@@ -0,0 +1,235 @@
+"""Slim SARIMAX model artifacts.
+
+A pickled ``SARIMAXResults`` drags along the training data, the full Kalman
+filter output and covariance matrices (tens of MB for the stored models),
+all of which is unpickled on every load.  Forecasting only needs the model
+specification, the estimated parameters and the filter state after the last
+observation, so an artifact is a directory holding exactly that::
+
+    modelsarima2022/
+        spec.json        order, seasonal order, flags, params, nobs
+        state.npy        predicted state for the first forecast step
+        state_cov.npy    its covariance
+        endog.npy        training observations (optional)
+        endog_index.npy  their dates as int64 nanoseconds (optional)
+
+The training observations are only read when the model is re-estimated
+(see :mod:`forecasting.update`).  The ``.npy`` files are memory-mapped on
+load and loaded models are kept in a small in-process cache.  Legacy ``.pkl``/``.pkl.gz`` pickles are converted
+through :func:`convert_pickle`.
+"""
+
+import gzip
+import json
+import os
+import pickle
+import shutil
+import uuid
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from forecasting.cache import LRUCache
+
+FORMAT_VERSION = 1
+
+_models = LRUCache(8)
+
+
+class CompactSARIMA:
+    """Forecast-capable SARIMAX rebuilt from an artifact.
+
+    The model is a one-observation SARIMAX whose only observation is missing
+    and whose initial state is the stored end-of-sample state, so its
+    prediction for that observation is the original model's first forecast
+    step.  :meth:`get_forecast` mirrors ``SARIMAXResults.get_forecast``; the
+    returned values are positional (step 0 is the first forecast step).
+    """
+
+    def __init__(self, spec, state, state_cov, endog=None, endog_index=None):
+        self.spec = spec
+        self.nobs = spec["nobs"]
+        self.params = pd.Series(spec["params"], index=spec["param_names"])
+        self.state = state
+        self.state_cov = state_cov
+        self.endog = endog
+        self.endog_index = endog_index
+        self.model = self._model(pd.Series([np.nan], name=spec.get("endog_name")))
+        self._results = self.model.filter(self.params.values)
+
+    def __reduce__(self):
+        # Hanya spec, state dan data latih yang dikirim antar proses; model statsmodels dibangun ulang
+        return CompactSARIMA, (self.spec, np.asarray(self.state), np.asarray(self.state_cov),
+                               None if self.endog is None else np.asarray(self.endog),
+                               None if self.endog_index is None else np.asarray(self.endog_index))
+
+    def history(self):
+        """The training observations as a Series (dated when known), or ``None`` if not stored."""
+        if self.endog is None:
+            return None
+        index = pd.DatetimeIndex(np.asarray(self.endog_index)) if self.endog_index is not None else None
+        return pd.Series(np.asarray(self.endog, dtype=float), index=index, name=self.spec.get("endog_name"))
+
+    @property
+    def last_date(self):
+        last_date = self.spec.get("last_date")
+        return pd.Timestamp(last_date) if last_date else None
+
+    def _model(self, endog):
+        from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+        init_kwds = dict(self.spec["init_kwds"])
+        init_kwds["trend_offset"] = init_kwds.get("trend_offset", 1) + self.nobs
+        model = SARIMAX(endog, **init_kwds)
+        model.ssm.initialize_known(np.asarray(self.state), np.asarray(self.state_cov))
+        return model
+
+    def get_forecast(self, steps=1, **kwargs):
+        return self._results.get_prediction(start=0, end=steps - 1, **kwargs)
+
+    def forecast(self, steps=1, **kwargs):
+        return self.get_forecast(steps, **kwargs).predicted_mean
+
+    def extend(self, endog):
+        """Filter new observations with the stored parameters (no re-estimation).
+
+        Returns ``(model, standardized_errors)``: a new ``CompactSARIMA``
+        positioned after the last new observation and the standardized
+        one-step-ahead forecast errors of those observations.
+        """
+        endog = pd.Series(endog)
+        results = self._model(pd.Series(np.asarray(endog, dtype=float), name=self.spec.get("endog_name"))).filter(
+            self.params.values
+        )
+        spec = dict(self.spec, nobs=self.nobs + len(endog))
+        if isinstance(endog.index, pd.DatetimeIndex) and len(endog):
+            spec["last_date"] = endog.index[-1].isoformat()
+        endog_values, endog_index = None, None
+        if self.endog is not None:
+            endog_values = np.concatenate([np.asarray(self.endog, dtype=float), np.asarray(endog, dtype=float)])
+            if self.endog_index is not None and isinstance(endog.index, pd.DatetimeIndex):
+                endog_index = np.concatenate([np.asarray(self.endog_index), endog.index.asi8])
+        extended = CompactSARIMA(spec, results.predicted_state[:, -1].copy(),
+                                 results.predicted_state_cov[:, :, -1].copy(), endog_values, endog_index)
+        return extended, results.standardized_forecasts_error[0]
+
+    def save(self, path):
+        return _write_artifact(path, self.spec, self.state, self.state_cov, self.endog, self.endog_index)
+
+
+def _spec_from_results(results):
+    model = results.model
+    init_kwds = model._get_init_kwds()
+    if init_kwds.get("simple_differencing") or model.k_exog or init_kwds.get("concentrate_scale"):
+        raise ValueError("Only SARIMAX models without exog, simple differencing or concentrated scale are supported")
+
+    spec = {
+        "format_version": FORMAT_VERSION,
+        "init_kwds": {key: list(value) if isinstance(value, tuple) else value for key, value in init_kwds.items()},
+        "param_names": list(model.param_names),
+        "params": [float(value) for value in np.asarray(results.params)],
+        "nobs": int(model.nobs),
+        "endog_name": model.endog_names,
+        "llf": float(results.llf),
+        "aic": float(results.aic),
+    }
+    row_labels = model.data.row_labels
+    if isinstance(row_labels, pd.DatetimeIndex) and len(row_labels):
+        spec["first_date"] = row_labels[0].isoformat()
+        spec["last_date"] = row_labels[-1].isoformat()
+    return spec
+
+
+def from_results(results):
+    """In-memory ``CompactSARIMA`` for a fitted ``SARIMAXResults``."""
+    row_labels = results.model.data.row_labels
+    return CompactSARIMA(
+        _spec_from_results(results), results.predicted_state[:, -1].copy(), results.predicted_state_cov[:, :, -1].copy(),
+        np.asarray(results.model.endog[:, 0], dtype=float).copy(),
+        row_labels.asi8.copy() if isinstance(row_labels, pd.DatetimeIndex) else None,
+    )
+
+
+def save_results(results, path):
+    """Write the slim artifact for a fitted ``SARIMAXResults`` to directory ``path``."""
+    return from_results(results).save(path)
+
+
+def _write_artifact(path, spec, state, state_cov, endog=None, endog_index=None):
+    path = Path(path)
+    # Nama sementara unik per penulis (proses dan thread), lalu rename atomik ke tujuan
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.mkdir(parents=True)
+    np.save(tmp / "state.npy", np.ascontiguousarray(state))
+    np.save(tmp / "state_cov.npy", np.ascontiguousarray(state_cov))
+    if endog is not None:
+        np.save(tmp / "endog.npy", np.ascontiguousarray(endog, dtype=float))
+        if endog_index is not None:
+            np.save(tmp / "endog_index.npy", np.ascontiguousarray(endog_index, dtype=np.int64))
+    (tmp / "spec.json").write_text(json.dumps(spec, indent=2))
+    shutil.rmtree(path, ignore_errors=True)
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        # Penulis lain mengganti direktori lebih dulu; artefaknya dipakai
+        shutil.rmtree(tmp, ignore_errors=True)
+        if not is_artifact(path):
+            raise
+    return path
+
+
+def load_pickle(path):
+    path = Path(path)
+    opener = gzip.open if path.suffix == ".gz" else open
+    with opener(path, "rb") as f:
+        return pickle.load(f)
+
+
+def artifact_path(pickle_path):
+    """Artifact directory that corresponds to a legacy pickle path."""
+    name = Path(pickle_path).name
+    for suffix in (".gz", ".pkl"):
+        name = name.removesuffix(suffix)
+    return Path(pickle_path).with_name(name)
+
+
+def convert_pickle(pickle_path, path=None):
+    """Convert a legacy pickled ``SARIMAXResults`` into a slim artifact."""
+    return save_results(load_pickle(pickle_path), path or artifact_path(pickle_path))
+
+
+def is_artifact(path):
+    return (Path(path) / "spec.json").is_file()
+
+
+def load_model(path):
+    """Load a forecast-capable model from an artifact or a legacy pickle.
+
+    Legacy pickles are converted next to the original the first time they are
+    loaded, so later loads take the fast path.
+    """
+    path = Path(path)
+    if not is_artifact(path):
+        converted = artifact_path(path)
+        if not is_artifact(converted):
+            convert_pickle(path, converted)
+        path = converted
+
+    spec_file = path / "spec.json"
+    key = (str(path.resolve()), spec_file.stat().st_mtime_ns)
+    model = _models.get(key)
+    if model is None:
+        spec = json.loads(spec_file.read_text())
+        state = np.load(path / "state.npy", mmap_mode="r")
+        state_cov = np.load(path / "state_cov.npy", mmap_mode="r")
+        endog = np.load(path / "endog.npy", mmap_mode="r") if (path / "endog.npy").exists() else None
+        endog_index = np.load(path / "endog_index.npy") if (path / "endog_index.npy").exists() else None
+        model = CompactSARIMA(spec, state, state_cov, endog, endog_index)
+        _models.put(key, model)
+    return model
+
+
+def model_exists(path):
+    path = Path(path)
+    return is_artifact(path) or path.is_file() or is_artifact(artifact_path(path))
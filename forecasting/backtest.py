@@ -0,0 +1,274 @@
+"""Rolling-origin backtests with fixed parameters.
+
+A backtest asks how well a model specification would have forecast the
+observations it had not seen: at every origin ``o`` the first ``o``
+observations are known and the next ``horizon`` are forecast, and the errors
+are summarised per step ahead as MAPE, RMSE and MASE.
+
+Re-estimating the model at every origin would cost one maximum-likelihood fit
+per origin.  Instead the parameters are estimated once -- taken from a
+stored model, or fitted on the data before the first origin -- and the
+series is run through the Kalman filter a single time with them.  The
+filter's predicted state at position ``o`` is exactly the state an origin
+``o`` forecast starts from, so the forecasts of all origins are propagated
+together as one ``(k_states, n_origins)`` matrix.
+
+Items (products) and chunks of origins are spread over the shared process
+pool in two rounds, like :mod:`forecasting.order_search`: parameter
+estimation per item, then filtering and forecasting per origin chunk.
+Results are cached per ``(series hash, spec, params, origins, horizon)``.
+"""
+
+import hashlib
+import json
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from forecasting import workers
+from forecasting.cache import LRUCache
+from forecasting.screening import series_hash
+
+HORIZON = 12
+METRICS = ("MAPE", "RMSE", "MASE")
+
+_results = LRUCache(256)
+
+
+def rolling_origins(n, horizon=HORIZON, min_train=None, step=1):
+    """Origins (numbers of known observations) from ``min_train`` up to ``n - horizon``."""
+    min_train = n // 2 if min_train is None else min_train
+    return np.arange(max(min_train, 1), n - horizon + 1, max(step, 1))
+
+
+def _seasonal_period(init_kwds):
+    seasonal_order = init_kwds.get("seasonal_order") or (0, 0, 0, 0)
+    return max(int(seasonal_order[3]), 1)
+
+
+def _sarimax(values, init_kwds):
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    return SARIMAX(np.asarray(values, dtype=float), **init_kwds)
+
+
+def estimate_params(values, init_kwds):
+    """Maximum-likelihood parameters of ``init_kwds``'s SARIMAX on ``values``."""
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        return np.asarray(_sarimax(values, init_kwds).fit(disp=False).params, dtype=float)
+
+
+def _time_slice(matrix, times):
+    """Intercept values at ``times`` as ``(k, len(times))``, whether time-varying or not."""
+    matrix = np.asarray(matrix, dtype=float)
+    if matrix.ndim == 2 and matrix.shape[1] > 1:
+        return matrix[:, times]
+    return np.broadcast_to(matrix.reshape(-1, 1), (matrix.shape[0], len(times)))
+
+
+def forecast_origins(values, init_kwds, params, origins, horizon=HORIZON):
+    """``(len(origins), horizon)`` point forecasts made at each origin with fixed ``params``.
+
+    Row ``i`` holds the forecasts of ``values[origins[i]:origins[i] + horizon]``
+    from the first ``origins[i]`` observations, on the model's own scale.
+    """
+    origins = np.asarray(origins, dtype=int)
+    end = int(origins.max()) + horizon
+    model = _sarimax(values[:end], init_kwds)
+    results = model.filter(params)
+    ssm = model.ssm
+
+    design, transition = np.asarray(ssm["design"], dtype=float), np.asarray(ssm["transition"], dtype=float)
+    if design.ndim == 3 and design.shape[2] > 1 or transition.ndim == 3 and transition.shape[2] > 1:
+        raise ValueError("Backtests need time-invariant design and transition matrices")
+    design, transition = design.reshape(design.shape[:2]), transition.reshape(transition.shape[:2])
+
+    state = results.predicted_state[:, origins]
+    predicted = np.empty((len(origins), horizon))
+    for step in range(horizon):
+        times = origins + step
+        predicted[:, step] = (_time_slice(ssm["obs_intercept"], times) + design @ state)[0]
+        state = transition @ state + _time_slice(ssm["state_intercept"], times)
+    return predicted
+
+
+def naive_scales(values, origins, period=1):
+    """In-sample mean absolute (seasonal) naive error of ``values[:o]`` for every origin ``o``.
+
+    This is MASE's denominator; origins with fewer than ``period + 1``
+    observations get ``nan``.
+    """
+    values = np.asarray(values, dtype=float)
+    diffs = np.abs(values[period:] - values[:-period]) if len(values) > period else np.empty(0)
+    diffs = np.where(np.isfinite(diffs), diffs, 0.0)
+    cumulative = np.concatenate([[0.0], np.cumsum(diffs)])
+    counts = np.asarray(origins, dtype=int) - period
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(counts > 0, cumulative[np.clip(counts, 0, len(diffs))] / counts, np.nan)
+
+
+def horizon_metrics(actual, predicted, scales):
+    """MAPE (%), RMSE and MASE per step ahead from ``(n_origins, horizon)`` arrays.
+
+    MAPE skips zero actuals (weeks without sales), so ``n_mape`` can be
+    smaller than ``n``.
+    """
+    errors = actual - predicted
+    valid = np.isfinite(errors)
+    abs_errors = np.where(valid, np.abs(errors), np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ape = np.where(valid & (actual != 0), abs_errors / np.abs(actual), np.nan)
+        scaled = np.where(valid & (scales[:, None] > 0), abs_errors / scales[:, None], np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        frame = pd.DataFrame({
+            "Horizon": np.arange(1, actual.shape[1] + 1),
+            "MAPE": 100 * np.nanmean(ape, axis=0),
+            "RMSE": np.sqrt(np.nanmean(np.where(valid, errors, np.nan) ** 2, axis=0)),
+            "MASE": np.nanmean(scaled, axis=0),
+            "n": valid.sum(axis=0),
+            "n_mape": np.isfinite(ape).sum(axis=0),
+        })
+    return frame
+
+
+def _params_task(item):
+    name, values, init_kwds, params, origins = item
+    if params is not None:
+        return name, np.asarray(params, dtype=float), None
+    try:
+        return name, estimate_params(values[:int(origins[0])], init_kwds), None
+    except Exception as exc:
+        return name, None, f"{type(exc).__name__}: {exc}"
+
+
+def _origins_task(item):
+    name, values, init_kwds, params, origins, horizon = item
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            return name, origins, forecast_origins(values, init_kwds, params, origins, horizon), None
+    except Exception as exc:
+        return name, origins, None, f"{type(exc).__name__}: {exc}"
+
+
+def _cache_key(values, init_kwds, params, origins, horizon, log_scale):
+    digest = hashlib.sha256(json.dumps([init_kwds, horizon, log_scale], sort_keys=True, default=list).encode())
+    digest.update(np.ascontiguousarray(origins, dtype=np.int64).tobytes())
+    if params is not None:
+        digest.update(np.ascontiguousarray(params, dtype=float).tobytes())
+    return series_hash(values) + digest.hexdigest()
+
+
+def run_backtests(series, init_kwds, params=None, horizon=HORIZON, origins=None, log_scale=False,
+                  max_workers=None, progress=None):
+    """Backtest one specification on several series.
+
+    ``series`` maps a name (product) to its values; ``params`` is one
+    parameter vector for every series (a stored model's), a dict of them, or
+    ``None`` to estimate each series' parameters on the data before its first
+    origin.  ``log_scale`` evaluates ``expm1`` of actuals and forecasts (the
+    Total page models ``log1p(Jumlah)``).
+
+    Returns ``{name: result}`` where a result has ``metrics`` (one row per
+    step ahead), ``origins``, ``params`` and ``error`` (``None`` on success).
+    """
+    init_kwds = {key: tuple(value) if isinstance(value, list) else value for key, value in dict(init_kwds).items()}
+    init_kwds.pop("trend_offset", None)
+    period = _seasonal_period(init_kwds)
+    n_workers = max_workers or workers.DEFAULT_WORKERS
+
+    results, pending = {}, []
+    for name, values in series.items():
+        values = np.asarray(values, dtype=float)
+        item_origins = rolling_origins(len(values), horizon) if origins is None else np.asarray(origins, dtype=int)
+        item_origins = item_origins[(item_origins > 0) & (item_origins + horizon <= len(values))]
+        item_params = params.get(name) if isinstance(params, dict) else params
+        if not len(item_origins):
+            results[name] = {"metrics": None, "origins": item_origins, "params": item_params,
+                             "error": "Data terlalu pendek untuk backtest"}
+            continue
+        key = _cache_key(values, init_kwds, item_params, item_origins, horizon, log_scale)
+        cached = _results.get(key)
+        if cached is not None:
+            results[name] = cached
+        else:
+            pending.append((name, values, item_params, item_origins, key))
+
+    # Putaran 1: parameter per deret (diambil dari model tersimpan atau di-fit sekali)
+    by_name = {name: (values, item_origins, key) for name, values, _, item_origins, key in pending}
+    fitted = {}
+    params_items = [(name, values, init_kwds, item_params, item_origins)
+                    for name, values, item_params, item_origins, _ in pending]
+    params_results = workers.imap_unordered(_params_task, params_items, n_workers, force_pool=True)
+    for _, (name, item_params, error) in params_results:
+        if error is not None:
+            results[name] = {"metrics": None, "origins": by_name[name][1], "params": None, "error": error}
+        else:
+            fitted[name] = item_params
+
+    # Putaran 2: filter dan ramalan per potongan origin; deret sedikit dibagi ke banyak potongan
+    n_chunks = max(1, -(-n_workers // max(len(fitted), 1)))
+    origin_items = [
+        (name, by_name[name][0], init_kwds, fitted[name], np.asarray(chunk, dtype=int), horizon)
+        for name in fitted
+        for chunk in workers.chunked(by_name[name][1], n_chunks)
+    ]
+    forecasts, errors = {}, {}
+    for done, (_, (name, chunk, predicted, error)) in enumerate(
+        workers.imap_unordered(_origins_task, origin_items, n_workers, force_pool=True), 1
+    ):
+        if error is not None:
+            errors[name] = error
+        else:
+            forecasts.setdefault(name, []).append((chunk, predicted))
+        if progress is not None:
+            progress(done, len(origin_items))
+
+    for name in fitted:
+        values, item_origins, key = by_name[name]
+        if name in errors:
+            results[name] = {"metrics": None, "origins": item_origins, "params": fitted[name], "error": errors[name]}
+            continue
+        parts = sorted(forecasts[name], key=lambda part: part[0][0])
+        predicted = np.vstack([part[1] for part in parts])
+        actual = values[item_origins[:, None] + np.arange(horizon)[None, :]]
+        if log_scale:
+            actual, predicted, history = np.expm1(actual), np.expm1(predicted), np.expm1(values)
+        else:
+            history = values
+        result = {
+            "metrics": horizon_metrics(actual, predicted, naive_scales(history, item_origins, period)),
+            "origins": item_origins,
+            "params": fitted[name],
+            "error": None,
+        }
+        _results.put(key, result)
+        results[name] = result
+    return results
+
+
+def backtest_model(model, series, horizon=HORIZON, origins=None, log_scale=True, max_workers=None):
+    """Per-horizon metrics of a stored (compact) model's specification and parameters on ``series``.
+
+    Raises ``ValueError`` when the series is too short or the backtest fails.
+    """
+    result = run_backtests({"model": series}, model.spec["init_kwds"], model.params.to_numpy(),
+                           horizon, origins, log_scale, max_workers)["model"]
+    if result["error"] is not None:
+        raise ValueError(result["error"])
+    return result["metrics"]
+
+
+def summary(results, name_col="Nama Barang"):
+    """Long frame of per-horizon metrics for every successful result, plus an error frame."""
+    frames = [result["metrics"].assign(**{name_col: name}) for name, result in results.items()
+              if result["error"] is None]
+    metrics = pd.concat(frames, ignore_index=True)[[name_col, "Horizon", *METRICS, "n", "n_mape"]] if frames \
+        else pd.DataFrame(columns=[name_col, "Horizon", *METRICS, "n", "n_mape"])
+    errors = pd.DataFrame([{name_col: name, "error": result["error"]}
+                           for name, result in results.items() if result["error"] is not None],
+                          columns=[name_col, "error"])
+    return metrics, errors
@@ -0,0 +1,60 @@
+"""Small thread-safe caches shared across Streamlit sessions."""
+
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+CACHE_ROOT = Path(os.environ.get("PERAMALAN_CACHE_DIR", Path(__file__).resolve().parent.parent / ".cache"))
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def cache_dir(name):
+    """Return (and create) a subdirectory of the on-disk cache."""
+    path = CACHE_ROOT / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def prune_dir(path, max_files):
+    """Delete the oldest files in ``path`` so at most ``max_files`` remain."""
+    files = sorted((f for f in Path(path).iterdir() if f.is_file()), key=lambda f: f.stat().st_mtime)
+    for stale in files[:max(0, len(files) - max_files)]:
+        try:
+            stale.unlink()
+        except OSError:
+            pass
@@ -0,0 +1,147 @@
+"""Chart helpers that keep the Plotly payload sent to the browser small.
+
+Long histories are downsampled for display with LTTB (largest triangle three
+buckets), which keeps peaks and the overall shape, or with min/max buckets.
+Traces that still have more than ``WEBGL_THRESHOLD`` points are drawn with
+``Scattergl``.  Figures that only differ in chart type are rendered as one
+figure whose trace type is switched in the browser, so the data is sent once.
+
+Only the displayed data is reduced; tables and exports keep every row.
+"""
+
+import numpy as np
+
+MAX_POINTS = 1500
+WEBGL_THRESHOLD = 1000
+
+_KIND_LABELS = {"line": "Garis", "bar": "Batang", "area": "Area"}
+
+
+def _as_float(x):
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        return x.astype("datetime64[ns]").astype(np.int64).astype(float)
+    return x.astype(float)
+
+
+def lttb_indices(x, y, n_out):
+    """Positions of the ``n_out`` points LTTB keeps (first and last included)."""
+    x = _as_float(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Titik berikutnya diwakili rata-rata bucket sesudahnya
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        avg_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        area = np.abs(
+            (x[a] - avg_x) * (y[start:stop] - y[a]) - (x[a] - x[start:stop]) * (avg_y - y[a])
+        )
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def minmax_indices(y, n_out):
+    """Positions of each bucket's minimum and maximum, in order (about ``n_out`` points)."""
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    n_buckets = n_out // 2
+    if n_buckets < 1 or n <= n_out:
+        return np.arange(n)
+    edges = np.linspace(0, n, n_buckets + 1).astype(int)
+    starts = edges[:-1]
+    lows = np.minimum.reduceat(y, starts)
+    highs = np.maximum.reduceat(y, starts)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    positions = np.arange(n)
+    is_low = y == lows[bucket]
+    is_high = y == highs[bucket]
+    first_low = np.full(n_buckets, n)
+    first_high = np.full(n_buckets, n)
+    np.minimum.at(first_low, bucket[is_low], positions[is_low])
+    np.minimum.at(first_high, bucket[is_high], positions[is_high])
+    return np.unique(np.concatenate([first_low, first_high, [0, n - 1]]))
+
+
+def downsample(x, y, max_points=MAX_POINTS, method="lttb"):
+    """Return ``(x, y)`` reduced to at most about ``max_points`` points, NaNs dropped."""
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    valid = ~np.isnan(y)
+    if not valid.all():
+        x, y = x[valid], y[valid]
+    if len(y) <= max_points:
+        return x, y
+    keep = lttb_indices(x, y, max_points) if method == "lttb" else minmax_indices(y, max_points)
+    return x[keep], y[keep]
+
+
+def add_line(fig, x, y, name=None, mode="lines+markers", max_points=MAX_POINTS, **kwargs):
+    """Add a downsampled line trace, drawn with WebGL when it is still long.
+
+    Markers are dropped once the series is too long for them to be readable.
+    """
+    import plotly.graph_objects as go
+
+    n_original = len(y)
+    x, y = downsample(x, y, max_points)
+    if n_original > max_points and "markers" in mode:
+        mode = "lines"
+    trace = go.Scattergl if len(y) > WEBGL_THRESHOLD else go.Scatter
+    fig.add_trace(trace(x=x, y=y, mode=mode, name=name, **kwargs))
+    return fig
+
+
+def series_figure(series_by_name, title=None, max_points=MAX_POINTS, **layout):
+    """Line figure of several ``pd.Series`` (index on the x axis), each downsampled."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for name, values in series_by_name.items():
+        add_line(fig, values.index, values.to_numpy(), name=name, max_points=max_points)
+    fig.update_layout(title=title, **layout)
+    return fig
+
+
+def switchable_figure(x, y, title=None, kinds=("line", "bar", "area"), **layout):
+    """One trace of ``x``/``y`` with buttons that switch it between ``kinds``.
+
+    Replaces several figures of the same data: the switch is a client-side
+    restyle, so the points are sent to the browser only once.
+    """
+    import plotly.graph_objects as go
+
+    styles = {
+        "line": {"type": "scatter", "mode": "lines+markers", "fill": "none"},
+        "bar": {"type": "bar"},
+        "area": {"type": "scatter", "mode": "lines", "fill": "tozeroy"},
+    }
+    first = styles[kinds[0]]
+    fig = go.Figure(go.Bar(x=x, y=y) if first["type"] == "bar" else go.Scatter(x=x, y=y, mode=first["mode"], fill=first["fill"]))
+    buttons = [
+        dict(label=_KIND_LABELS.get(kind, kind), method="restyle",
+             args=[{key: [value] for key, value in styles[kind].items()}])
+        for kind in kinds
+    ]
+    fig.update_layout(
+        title=title,
+        updatemenus=[dict(type="buttons", direction="right", buttons=buttons,
+                          x=1, xanchor="right", y=1.15, yanchor="top", showactive=True)],
+        **layout,
+    )
+    return fig
+
+
+def payload_bytes(fig):
+    """Size of the figure's JSON as sent to the browser."""
+    return len(fig.to_json().encode())
+
@@ -0,0 +1,110 @@
+"""ACF and PACF for many series at once.
+
+``statsmodels.tsa.stattools.acf``/``pacf`` handle one series per call, and
+their default PACF solves a Yule-Walker system per lag.  Here all series are
+zero-padded into one matrix: the autocovariances of every row come from one
+real FFT, and the PACF of every row from a Durbin-Levinson recursion that is
+vectorised across rows (one pass over the lags, not one per series).
+
+Results match statsmodels' defaults -- ``acf(x, nlags)`` (``adjusted=False``)
+and ``pacf(x, nlags)`` (``method="ywadjusted"``) -- to floating-point
+tolerance, and are cached per series content in an in-memory LRU.
+"""
+
+import numpy as np
+
+from forecasting.cache import LRUCache
+from forecasting.screening import series_hash
+
+MAX_LAGS = 40
+
+_results = LRUCache(1024)
+
+
+def _padded(series_list):
+    lengths = np.array([len(values) for values in series_list])
+    width = int(lengths.max()) if len(lengths) else 0
+    matrix = np.zeros((len(series_list), width))
+    for i, values in enumerate(series_list):
+        values = np.asarray(values, dtype=float)
+        # Demean per deret; nol di luar panjangnya tidak menambah kovarians
+        matrix[i, :len(values)] = values - values.mean()
+    return matrix, lengths
+
+
+def autocovariances(series_list, nlags):
+    """Sums ``sum_t x_t x_{t+k}`` for ``k = 0..nlags`` of every (demeaned) series.
+
+    Returns ``(sums, lengths)``; divide by ``n`` or ``n - k`` for the biased
+    or adjusted estimate.
+    """
+    matrix, lengths = _padded(series_list)
+    width = matrix.shape[1]
+    n_fft = 1 << int(np.ceil(np.log2(max(2 * width - 1, 1))))
+    spectrum = np.fft.rfft(matrix, n=n_fft, axis=1)
+    sums = np.fft.irfft(spectrum * spectrum.conj(), n=n_fft, axis=1)[:, :nlags + 1]
+    if sums.shape[1] < nlags + 1:
+        sums = np.pad(sums, ((0, 0), (0, nlags + 1 - sums.shape[1])))
+    return sums, lengths
+
+
+def durbin_levinson(autocorr):
+    """PACF of each row of ``autocorr`` (lag 0 first), solved for all rows together."""
+    n_rows, n_lags = autocorr.shape[0], autocorr.shape[1] - 1
+    pacf = np.zeros((n_rows, n_lags + 1))
+    pacf[:, 0] = 1.0
+    if n_lags == 0:
+        return pacf
+    phi = np.zeros((n_rows, n_lags + 1))
+    phi[:, 1] = autocorr[:, 1]
+    pacf[:, 1] = autocorr[:, 1]
+    sigma = 1.0 - autocorr[:, 1] ** 2
+    for k in range(2, n_lags + 1):
+        previous = phi[:, 1:k]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            reflection = (autocorr[:, k] - np.einsum("ij,ij->i", previous, autocorr[:, k - 1:0:-1])) / sigma
+        phi[:, 1:k] = previous - reflection[:, None] * previous[:, ::-1]
+        phi[:, k] = reflection
+        pacf[:, k] = reflection
+        sigma = sigma * (1.0 - reflection ** 2)
+    return pacf
+
+
+def _compute(series_list, nlags):
+    sums, lengths = autocovariances(series_list, nlags)
+    lags = np.arange(nlags + 1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        acf = sums / sums[:, :1]
+        adjusted = sums / np.maximum(lengths[:, None] - lags[None, :], 1)
+        pacf = durbin_levinson(adjusted / adjusted[:, :1])
+    return acf, pacf
+
+
+def correlograms(series_list, nlags=MAX_LAGS):
+    """``[(acf, pacf), ...]`` for each series, computed in one batch.
+
+    ``nlags`` is an int or one value per series; a series gets at most
+    ``len(series) // 2`` lags (the statsmodels limit for the PACF).
+    Series already seen are served from the cache.
+    """
+    values = [np.asarray(getattr(item, "values", item), dtype=float) for item in series_list]
+    if np.ndim(nlags) == 0:
+        nlags = [nlags] * len(values)
+    nlags = [max(min(int(lags), len(v) // 2), 1) for lags, v in zip(nlags, values)]
+    keys = [(series_hash(v), lags) for v, lags in zip(values, nlags)]
+
+    results = [_results.get(key) for key in keys]
+    missing = [i for i, result in enumerate(results) if result is None]
+    if missing:
+        max_lags = max(nlags[i] for i in missing)
+        acf, pacf = _compute([values[i] for i in missing], max_lags)
+        for row, i in enumerate(missing):
+            result = (acf[row, :nlags[i] + 1].copy(), pacf[row, :nlags[i] + 1].copy())
+            _results.put(keys[i], result)
+            results[i] = result
+    return results
+
+
+def acf_pacf(values, nlags=MAX_LAGS):
+    """``(acf, pacf)`` of a single series (cached)."""
+    return correlograms([values], nlags)[0]
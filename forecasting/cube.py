@@ -0,0 +1,134 @@
+"""Multi-resolution aggregate cube shared by the pages and the batch pipeline.
+
+One cleaned transactions frame is binned once into weekly, monthly and
+quarterly :class:`~forecasting.series.PeriodMatrix` objects (per product and
+overall) plus a product ranking by total quantity.  Charts, rankings and the
+weekly series for screening and forecasting are then lookups into the cube
+instead of fresh ``groupby``/``resample`` calls on every rerun.
+
+The daily per-product matrix (products x days) is the only large level and
+no page needs it up front, so it is built the first time it is requested.
+
+Cubes are cached per ``(upload digest, cleaning kind)``: the Total page's
+cleaning keeps one row per date, so its totals differ from the per-product
+frame's and it gets its own cube.
+"""
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from forecasting.cache import LRUCache
+from forecasting.series import PeriodMatrix
+
+LEVELS = ("D", "W", "M", "Q")
+EAGER_LEVELS = ("W", "M", "Q")
+
+_cubes = LRUCache(8)
+
+
+class AggregateCube:
+    """Totals per product and overall at every level in ``LEVELS``."""
+
+    def __init__(self, df, product_col="Nama Barang", date_col="Tanggal", value_col="Jumlah"):
+        self.product_col = product_col
+        self.date_col = date_col
+        self.value_col = value_col
+        self._df = df
+        self._lock = threading.Lock()
+        self._matrices = {level: self._build(level) for level in EAGER_LEVELS}
+        self._totals = {}
+
+        weekly = self._matrices["W"]
+        sums = weekly.values.sum(axis=1)
+        if product_col is not None:
+            # Urutan nama lalu stabil menurun, sama dengan groupby(...).sum().nlargest(n)
+            by_name = np.argsort(np.asarray(weekly.products, dtype=str), kind="stable")
+            order = by_name[np.argsort(-sums[by_name], kind="stable")]
+            self.ranking = pd.DataFrame({
+                product_col: weekly.products[order].to_numpy(),
+                value_col: sums[order],
+            })
+        else:
+            self.ranking = pd.DataFrame(columns=[value_col])
+
+    def _build(self, level):
+        return PeriodMatrix.from_frame(
+            self._df, product_col=self.product_col, date_col=self.date_col, value_col=self.value_col, freq=level
+        )
+
+    @property
+    def products(self):
+        return self._matrices["W"].products
+
+    def matrix(self, level):
+        """The per-product :class:`PeriodMatrix` for ``level``."""
+        matrix = self._matrices.get(level)
+        if matrix is None:
+            with self._lock:
+                matrix = self._matrices.get(level)
+                if matrix is None:
+                    matrix = self._matrices[level] = self._build(level)
+        return matrix
+
+    def total(self, level):
+        """Overall totals at ``level``, equal to ``resample(level).sum()`` on all rows."""
+        total = self._totals.get(level)
+        if total is None:
+            if level == "D" and level not in self._matrices:
+                dates = pd.DatetimeIndex(
+                    self._df[self.date_col] if self.date_col in self._df.columns else self._df.index
+                )
+                matrix = PeriodMatrix.from_frame(
+                    pd.DataFrame({self.date_col: dates, self.value_col: self._df[self.value_col].to_numpy()}),
+                    product_col=None, date_col=self.date_col, value_col=self.value_col, freq=level,
+                )
+                values = matrix.values[0]
+            else:
+                matrix = self.matrix(level)
+                values = matrix.values.sum(axis=0)
+            total = pd.Series(values, index=matrix.index, name=self.value_col)
+            self._totals[level] = total
+        return total
+
+    def series(self, level, product):
+        return self.matrix(level).series(product)
+
+    def top(self, n=5):
+        """The ``n`` products with the largest total quantity, largest first."""
+        return self.ranking.head(n)
+
+    def long(self, level, products):
+        """Long ``(period, product, value)`` frame for ``products`` at ``level``.
+
+        Only periods in which the product has a non-zero total are included,
+        like a ``groupby([period, product]).sum()`` on the transactions.
+        """
+        matrix = self.matrix(level)
+        frames = []
+        for product in products:
+            values = matrix.series(product)
+            values = values[values != 0]
+            frames.append(pd.DataFrame({
+                self.date_col: values.index,
+                self.product_col: product,
+                self.value_col: values.to_numpy(),
+            }))
+        if not frames:
+            return pd.DataFrame(columns=[self.date_col, self.product_col, self.value_col])
+        return pd.concat(frames, ignore_index=True).sort_values(
+            [self.date_col, self.product_col], kind="stable", ignore_index=True
+        )
+
+
+def aggregate_cube(df, key=None, product_col="Nama Barang"):
+    """Build (or fetch from cache when ``key`` is given) the cube for ``df``."""
+    if key is not None:
+        cached = _cubes.get(key)
+        if cached is not None:
+            return cached
+    cube = AggregateCube(df, product_col=product_col if product_col in df.columns else None)
+    if key is not None:
+        _cubes.put(key, cube)
+    return cube
@@ -0,0 +1,57 @@
+"""In-memory forecast exports.
+
+Exports are built in ``BytesIO`` buffers instead of a shared
+``forecast_results.xlsx`` in the working directory, so concurrent sessions
+never overwrite each other's file.  The download buttons receive a callable,
+so the bytes are only generated when the user actually clicks.
+"""
+
+import io
+
+import pandas as pd
+
+FORMATS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def to_bytes(df, fmt):
+    """Serialize ``df`` (without its index) to ``fmt`` in memory."""
+    buffer = io.BytesIO()
+    if fmt == "xlsx":
+        df.to_excel(buffer, index=False)
+    elif fmt == "csv":
+        buffer.write(df.to_csv(index=False).encode("utf-8"))
+    elif fmt == "parquet":
+        df.to_parquet(buffer, index=False)
+    else:
+        raise ValueError(f"Unsupported export format: {fmt}")
+    return buffer.getvalue()
+
+
+def combine(frames, key="Nama Barang"):
+    """Stack per-product forecast frames into one long table with a ``key`` column."""
+    if not frames:
+        return pd.DataFrame()
+    return pd.concat(
+        [frame.assign(**{key: name})[[key, *frame.columns]] for name, frame in frames.items()],
+        ignore_index=True,
+    )
+
+
+def download_buttons(df, base_name, label="Download Forecast Results", key=None):
+    """One lazily generated download button per format, side by side."""
+    import streamlit as st
+
+    for column, fmt in zip(st.columns(len(FORMATS)), FORMATS):
+        with column:
+            st.download_button(
+                f"{label} ({fmt})",
+                data=lambda fmt=fmt: to_bytes(df, fmt),
+                file_name=f"{base_name}.{fmt}",
+                mime=FORMATS[fmt],
+                key=f"{key or base_name}-{fmt}",
+                on_click="ignore",
+            )
@@ -0,0 +1,114 @@
+"""Forecast caches: compute the longest horizon once, slice per request.
+
+The Total page forecasts ``years * 12`` months, and the horizon slider goes
+up to ``MAX_TOTAL_STEPS``.  :func:`total_forecast` runs the model's forecast
+once at that horizon -- mean, confidence bounds and their ``expm1``
+back-transforms -- and keeps the arrays under ``(model fingerprint, data
+hash, order)``; a shorter horizon is a slice of them.
+
+Product forecasts are fitted per product; :func:`product_forecasts` keeps
+each result under ``(series hash, engine, order, steps)`` so pressing the
+forecast button again does not refit products already forecast.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from forecasting import models, workers
+from forecasting.cache import LRUCache
+from forecasting.screening import series_hash
+
+MAX_TOTAL_STEPS = 5 * 12
+ALPHA = 0.05
+
+_totals = LRUCache(32)
+_products = LRUCache(512)
+
+
+def model_fingerprint(model):
+    """Content hash of a (compact) model: its spec, parameters and filter state."""
+    digest = hashlib.sha256(json.dumps(model.spec, sort_keys=True, default=str).encode())
+    for array in (model.state, model.state_cov):
+        digest.update(np.ascontiguousarray(array, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+class HorizonForecast:
+    """Log-scale forecast arrays for ``MAX_TOTAL_STEPS`` months and their back-transforms."""
+
+    def __init__(self, index, mean_log, lower_log, upper_log):
+        self.index = index
+        self.mean_log = mean_log
+        self.lower_log = lower_log
+        self.upper_log = upper_log
+        self.mean = np.expm1(mean_log)
+        self.lower = np.expm1(lower_log)
+        self.upper = np.expm1(upper_log)
+
+    @property
+    def max_steps(self):
+        return len(self.index)
+
+    def frame(self, steps):
+        """The Total page's forecast table for the first ``steps`` months."""
+        if steps > self.max_steps:
+            raise ValueError(f"Horizon {steps} exceeds the cached {self.max_steps} steps")
+        return pd.DataFrame({
+            'Tanggal': self.index[:steps],
+            'Prediksi_Log': self.mean_log[:steps],
+            'Prediksi Jumlah': np.round(self.mean[:steps]).astype(int),
+        })
+
+    def conf_int(self, steps):
+        """Back-transformed confidence bounds for the first ``steps`` months."""
+        return pd.DataFrame({
+            'Batas Bawah': self.lower[:steps],
+            'Batas Atas': self.upper[:steps],
+        }, index=self.index[:steps])
+
+
+def total_forecast(model, series, max_steps=MAX_TOTAL_STEPS):
+    """Cached :class:`HorizonForecast` of ``model`` for the log-scale ``series``."""
+    key = (
+        model_fingerprint(model),
+        series_hash(series.to_numpy(dtype=float)) + series_hash(series.index.asi8),
+        json.dumps([model.spec["init_kwds"].get("order"), model.spec["init_kwds"].get("seasonal_order")]),
+        max_steps,
+    )
+    cached = _totals.get(key)
+    if cached is not None:
+        return cached
+
+    prediction = model.get_forecast(steps=max_steps)
+    ci = np.asarray(prediction.conf_int(alpha=ALPHA))
+    index = pd.date_range(start=series.index[-1], periods=max_steps + 1, freq=pd.offsets.MonthEnd())[1:]
+    forecast = HorizonForecast(index, np.asarray(prediction.predicted_mean), ci[:, 0], ci[:, 1])
+    _totals.put(key, forecast)
+    return forecast
+
+
+def _product_key(item, engine):
+    product, values, steps = item[:3]
+    order = item[3:5] if len(item) > 3 else None
+    return (str(product), series_hash(values.to_numpy()) + series_hash(values.index.asi8), engine,
+            json.dumps(order, default=list), steps)
+
+
+def product_forecasts(items, engine='sarima', max_workers=None):
+    """Yield forecaster results for ``items``; cached products first, then new fits as they finish."""
+    pending = []
+    for item in items:
+        key = _product_key(item, engine)
+        cached = _products.get(key)
+        if cached is not None:
+            yield cached
+        else:
+            pending.append((key, item))
+
+    for pos, result in workers.imap_unordered(models.FORECASTERS[engine], [item for _, item in pending], max_workers,
+                                              force_pool=True):
+        _products.put(pending[pos][0], result)
+        yield result
@@ -0,0 +1,259 @@
+"""Content-hashed ingestion of uploaded workbooks.
+
+Parsing an xlsx and cleaning it takes seconds, and Streamlit reruns the page
+script on every widget change.  Uploads are therefore keyed by the SHA-256 of
+their bytes: the parsed/cleaned frame is kept in a bounded in-memory LRU and
+mirrored to Parquet under ``.cache/ingest`` so it also survives a restart.
+The disk key includes ``CACHE_VERSION``, so a change to the parsing or
+cleaning code invalidates the frames written by the old code.
+
+Workbooks are streamed in openpyxl's read-only mode and only the
+``Tanggal``/``Jumlah``/``Nama Barang`` columns are kept, with compact dtypes.
+CSV and Parquet uploads go through the same cleaning path.  Cleaned frames
+stay compact: product names are a categorical (codes plus one lookup table
+of normalised names), quantities are ``int32`` and dates ``datetime64``.
+
+Frames returned from here are shared between reruns and sessions; callers
+must treat them as read-only.
+"""
+
+import hashlib
+import io
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from forecasting.cache import LRUCache, cache_dir, prune_dir
+
+MAX_MEMORY_ENTRIES = 16
+MAX_DISK_ENTRIES = 64
+# Naikkan setiap kali read_upload atau pembersih berubah, agar frame lama di disk tidak dipakai lagi
+CACHE_VERSION = 2
+
+# Hanya kolom ini yang dibaca dari file unggahan
+COLUMNS = ("Tanggal", "Jumlah", "Nama Barang")
+UPLOAD_TYPES = ["xlsx", "csv", "parquet"]
+
+_frames = LRUCache(MAX_MEMORY_ENTRIES)
+
+
+def _read_bytes(uploaded_file):
+    if isinstance(uploaded_file, (bytes, bytearray, memoryview)):
+        return bytes(uploaded_file)
+    if hasattr(uploaded_file, "getvalue"):
+        return uploaded_file.getvalue()
+    uploaded_file.seek(0)
+    return uploaded_file.read()
+
+
+def file_digest(uploaded_file):
+    """SHA-256 hex digest of an uploaded file's content."""
+    return hashlib.sha256(_read_bytes(uploaded_file)).hexdigest()
+
+
+def _compact(df):
+    if "Nama Barang" in df.columns:
+        df["Nama Barang"] = df["Nama Barang"].astype("category")
+    if "Jumlah" in df.columns and pd.api.types.is_integer_dtype(df["Jumlah"]):
+        df["Jumlah"] = pd.to_numeric(df["Jumlah"], downcast="integer")
+    return df
+
+
+def _read_xlsx(data):
+    """Stream the first sheet row by row, keeping only ``COLUMNS``."""
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, ())
+        positions = {name: i for i, name in enumerate(header) if name in COLUMNS}
+        columns = {name: [] for name in positions}
+        for row in rows:
+            if row is None or all(value is None for value in row):
+                continue
+            for name, i in positions.items():
+                columns[name].append(row[i] if i < len(row) else None)
+    finally:
+        workbook.close()
+    return pd.DataFrame({name: pd.Series(values, dtype=None if values else object) for name, values in columns.items()})
+
+
+def _read_csv(data):
+    # Jumlah dibaca sebagai teks: "1.930" adalah pemisah ribuan, bukan 1,93
+    return pd.read_csv(io.BytesIO(data), usecols=lambda name: name in COLUMNS,
+                       dtype={"Nama Barang": "category", "Jumlah": str})
+
+
+def _read_parquet(data):
+    import pyarrow.parquet as pq
+
+    names = pq.ParquetFile(io.BytesIO(data)).schema_arrow.names
+    return pd.read_parquet(io.BytesIO(data), columns=[name for name in COLUMNS if name in names])
+
+
+def read_upload(data):
+    """Parse xlsx, Parquet or CSV bytes (detected from the content) into a compact frame."""
+    if data[:2] == b"PK":
+        df = _read_xlsx(data)
+    elif data[:4] == b"PAR1":
+        df = _read_parquet(data)
+    else:
+        df = _read_csv(data)
+    return _compact(df)
+
+
+def _digits(values):
+    """Quantities with every non-digit character removed (``"1.200 pcs"`` -> ``"1200"``).
+
+    Missing values stay missing.  Whole numbers stored as floats (an integer
+    column with a blank cell) are kept as numbers rather than stringified,
+    where ``"1200.0"`` would become 12000.
+    """
+    if pd.api.types.is_integer_dtype(values):
+        # Sama dengan membuang tanda minus pada teks angka
+        return values.abs()
+    if pd.api.types.is_float_dtype(values):
+        integral = values.isna() | (values % 1 == 0)
+        if integral.all():
+            return values.abs()
+        whole = values.where(integral).abs().astype("Int64").astype(object)
+        values = values.astype(object).where(~(integral & values.notna()), whole)
+    return values.astype(str).str.replace(r'\D', '', regex=True).where(values.notna())
+
+
+def _narrow_int(values):
+    """Quantities as ``int32`` when they fit, otherwise ``int64``."""
+    if len(values) and values.max() > np.iinfo(np.int32).max:
+        return values.astype(np.int64)
+    return values.astype(np.int32)
+
+
+def normalise_products(names):
+    """Normalised product names as a categorical, working on the distinct names only.
+
+    Names are stripped, lower-cased and have runs of whitespace collapsed;
+    names that become equal share one category.  The categories (sorted) are
+    the lookup table, each row only stores its code.
+    """
+    names = names.astype("category") if not isinstance(names.dtype, pd.CategoricalDtype) else names
+    categories = names.cat.categories.astype(str)
+    codes = names.cat.codes.to_numpy()
+    if (codes < 0).any():
+        # Nilai kosong menjadi teks 'nan', seperti astype(str)
+        categories = categories.append(pd.Index(["nan"]))
+        codes = np.where(codes < 0, len(categories) - 1, codes)
+    normalised = categories.str.strip().str.lower().str.replace(r'\s+', ' ', regex=True)
+    lookup = pd.Index(normalised.unique()).sort_values()
+    new_codes = lookup.get_indexer(normalised)[codes]
+    return pd.Series(pd.Categorical.from_codes(new_codes, lookup), index=names.index, name=names.name)
+
+
+def clean_total(df):
+    """Cleaning used by the Total page: numeric ``Jumlah``, log scale, daily index."""
+    jumlah = pd.to_numeric(_digits(df["Jumlah"]), errors="coerce")
+    # Baris dengan kolom kosong dibuang; kolom lain tidak ikut disalin
+    keep = (df.notna().all(axis=1) & jumlah.notna()).to_numpy()
+    jumlah = jumlah[keep]
+    df = pd.DataFrame({
+        "Tanggal": pd.to_datetime(df["Tanggal"][keep]),
+        "Jumlah": _narrow_int(jumlah),
+        # Tambahkan transformasi log untuk stabilisasi variansi
+        "Jumlah_Log": np.log1p(jumlah),
+    })
+    df = df.sort_values("Tanggal")
+
+    # Drop duplicate Tanggal
+    df = df.drop_duplicates(subset="Tanggal")
+    df.set_index("Tanggal", inplace=True)
+    return df
+
+
+def clean_products(df):
+    """Cleaning used by the Product page: normalised names, positive ``Jumlah`` only."""
+    jumlah = pd.to_numeric(_digits(df['Jumlah']), errors='coerce').fillna(0)
+    names = normalise_products(df['Nama Barang'])
+    tanggal = pd.to_datetime(df['Tanggal'], errors='coerce')
+
+    # Satu mask untuk semua filter, baris hanya disalin sekali
+    excluded = names.cat.categories.str.contains('pekerjaan', case=False)
+    keep = ~excluded[names.cat.codes.to_numpy()] & tanggal.notna().to_numpy() & (jumlah > 0).to_numpy()
+    return pd.DataFrame({
+        'Tanggal': tanggal[keep],
+        'Jumlah': _narrow_int(jumlah[keep]),
+        'Nama Barang': names[keep].cat.remove_unused_categories(),
+    })
+
+
+CLEANERS = {
+    "raw": lambda df: df,
+    "total": clean_total,
+    "produk": clean_products,
+}
+
+
+def _disk_paths(digest, kind):
+    base = cache_dir("ingest") / f"{digest}-{kind}-v{CACHE_VERSION}"
+    return base.with_suffix(".parquet"), base.with_suffix(".pkl")
+
+
+def _load_from_disk(digest, kind):
+    parquet_path, pickle_path = _disk_paths(digest, kind)
+    try:
+        if parquet_path.exists():
+            return pd.read_parquet(parquet_path)
+        if pickle_path.exists():
+            return pd.read_pickle(pickle_path)
+    except Exception:
+        # Corrupt or unreadable cache entry: fall through and re-parse.
+        pass
+    return None
+
+
+def _write_atomic(path, write):
+    # Nama sementara unik per penulis (proses dan thread), lalu rename atomik ke tujuan
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _store_on_disk(digest, kind, df):
+    parquet_path, pickle_path = _disk_paths(digest, kind)
+    try:
+        _write_atomic(parquet_path, df.to_parquet)
+    except Exception:
+        # Mixed-type object columns (typical for raw uploads) or no Parquet
+        # engine installed: keep a pickle instead.
+        try:
+            _write_atomic(pickle_path, df.to_pickle)
+        except Exception:
+            return
+    prune_dir(parquet_path.parent, MAX_DISK_ENTRIES)
+
+
+def load_frame(uploaded_file, kind="raw"):
+    """Return the parsed upload after applying the ``kind`` cleaner, cached by content."""
+    data = _read_bytes(uploaded_file)
+    digest = hashlib.sha256(data).hexdigest()
+    key = (digest, kind)
+
+    df = _frames.get(key)
+    if df is not None:
+        return df
+
+    df = _load_from_disk(digest, kind)
+    if df is None:
+        if kind == "raw":
+            df = read_upload(data)
+        else:
+            df = CLEANERS[kind](load_frame(data, "raw"))
+        _store_on_disk(digest, kind, df)
+
+    _frames.put(key, df)
+    return df
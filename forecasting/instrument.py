@@ -0,0 +1,163 @@
+"""Per-stage timing for page reruns.
+
+A page creates one :class:`Recorder` per rerun and calls :meth:`Recorder.lap`
+at the start of each pipeline stage; the previous stage is closed with its
+wall time and resident-memory delta.  On :meth:`Recorder.finish` the stages
+are logged as one JSON line to ``.cache/logs/timings.jsonl`` (logger
+``forecasting.timings``), so timings can be aggregated across sessions.
+
+When profiling is requested, the stage that was slowest on the previous
+rerun is run under ``cProfile`` and its top functions are kept.
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import time
+import uuid
+
+from forecasting import state
+from forecasting.cache import cache_dir
+
+logger = logging.getLogger("forecasting.timings")
+
+
+def _configure_logger():
+    if logger.handlers:
+        return
+    handler = logging.FileHandler(cache_dir("logs") / "timings.jsonl", encoding="utf-8")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def rss_mb():
+    """Current resident set size of this process in MB (``None`` when unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError, AttributeError):
+        try:
+            import resource
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        except ImportError:
+            return None
+
+
+class Recorder:
+    """Lap timer for the stages of one rerun."""
+
+    def __init__(self, page, session=None, profile_stage=None):
+        self.page = page
+        self.session = session or uuid.uuid4().hex[:12]
+        self.profile_stage = profile_stage
+        self.stages = []
+        self.profile = None
+        self._current = None
+
+    def lap(self, name):
+        """Close the running stage (if any) and start ``name``."""
+        self._close()
+        profiler = None
+        if name == self.profile_stage:
+            profiler = cProfile.Profile()
+            profiler.enable()
+        self._current = (name, time.perf_counter(), rss_mb(), profiler)
+
+    def _close(self):
+        if self._current is None:
+            return
+        name, started, rss_before, profiler = self._current
+        seconds = time.perf_counter() - started
+        if profiler is not None:
+            profiler.disable()
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(25)
+            self.profile = (name, out.getvalue())
+        rss_after = rss_mb()
+        self.stages.append({
+            "stage": name,
+            "seconds": round(seconds, 6),
+            "rss_mb": None if rss_after is None else round(rss_after, 1),
+            "rss_delta_mb": None if rss_after is None or rss_before is None else round(rss_after - rss_before, 1),
+        })
+        self._current = None
+
+    def finish(self):
+        """Close the last stage and write the rerun's JSON log line."""
+        self._close()
+        _configure_logger()
+        logger.info(json.dumps({
+            "ts": time.time(),
+            "page": self.page,
+            "session": self.session,
+            "total_seconds": round(sum(stage["seconds"] for stage in self.stages), 6),
+            "stages": self.stages,
+        }))
+        return self.stages
+
+    def slowest(self):
+        return max(self.stages, key=lambda stage: stage["seconds"])["stage"] if self.stages else None
+
+
+def recorder_for_page(page):
+    """Create the rerun's recorder from Streamlit session state (sidebar toggles included)."""
+    import streamlit as st
+
+    state = st.session_state
+    session = state.setdefault("_timing_session", uuid.uuid4().hex[:12])
+    profiling = state.get(f"_profile:{page.split('/')[0]}")
+    profile_stage = state.get(f"_slowest_stage:{page}") if profiling else None
+    return Recorder(page, session, profile_stage)
+
+
+def recorder_for_fragment(page, fragment):
+    """Recorder for a fragment; fragment reruns do not reach the page's own recorder."""
+    recorder = recorder_for_page(f"{page}/{fragment}")
+    recorder.parent_page = page
+    return recorder
+
+
+def finish_fragment(recorder):
+    """Log a fragment's stages and keep them for the page's sidebar panel."""
+    import streamlit as st
+
+    stages = recorder.finish()
+    st.session_state.setdefault(f"_fragments:{recorder.parent_page}", {})[recorder.page] = stages
+    st.session_state[f"_slowest_stage:{recorder.page}"] = recorder.slowest()
+    if recorder.profile is not None:
+        st.session_state[f"_fragment_profile:{recorder.parent_page}"] = recorder.profile
+    return stages
+
+
+def render_sidebar(recorder):
+    """Finish ``recorder`` and show its timings in an optional sidebar panel."""
+    import pandas as pd
+    import streamlit as st
+
+    stages = recorder.finish()
+    st.session_state[f"_slowest_stage:{recorder.page}"] = recorder.slowest()
+    for fragment_stages in st.session_state.get(f"_fragments:{recorder.page}", {}).values():
+        stages = stages + fragment_stages
+
+    if not st.sidebar.checkbox("Tampilkan panel performa", key=f"_panel:{recorder.page}"):
+        return
+    with st.sidebar.expander("⏱️ Waktu per tahap", expanded=True):
+        if stages:
+            table = pd.DataFrame(stages).set_index("stage")
+            st.dataframe(table)
+            st.caption(f"Total: {table['seconds'].sum():.3f} detik, paling lambat: {table['seconds'].idxmax()}")
+        sizes = state.footprint()
+        if sizes:
+            st.caption(f"Memori sesi: {sum(sizes.values()):.1f} MB")
+            st.dataframe(pd.Series(sizes, name="MB").round(2))
+        st.checkbox("Profil tahap paling lambat (rerun berikutnya)", key=f"_profile:{recorder.page}")
+        profile = recorder.profile or st.session_state.get(f"_fragment_profile:{recorder.page}")
+        if profile is not None:
+            name, text = profile
+            st.caption(f"cProfile untuk tahap '{name}'")
+            st.code(text)
@@ -0,0 +1,184 @@
+"""Background jobs for model fits, shared by every Streamlit session.
+
+A fit started on the script thread blocks the session, and any widget
+change reruns the script and throws the half-finished fit away.  Here a fit
+is submitted as a :class:`Job`: a runner thread drives the work (on the
+shared process pool from :mod:`forecasting.workers`), so the script returns
+immediately.  The session only keeps the job ID in ``st.session_state``,
+which survives reruns; the job itself lives in this module's registry.
+
+A job's ID is the hash of its request key, so submitting an identical
+request while it is running -- or after it finished successfully -- returns
+the existing job instead of starting a second fit.  Failed jobs are
+replaced on the next submit; finished jobs are dropped oldest first once
+more than ``MAX_FINISHED`` are kept.  :func:`session_job` remembers a job's
+ID in the session, so a failed job stays on screen (with its error) instead
+of being resubmitted on every rerun.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+from forecasting import workers
+
+MAX_FINISHED = 64
+POLL_SECONDS = 1.0
+
+PENDING, RUNNING, DONE, ERROR = "pending", "running", "done", "error"
+
+_lock = threading.Lock()
+_jobs = OrderedDict()
+
+
+class Job:
+    """One submitted request: status, progress and the results produced so far."""
+
+    def __init__(self, job_id, label, total):
+        self.id = job_id
+        self.label = label
+        self.total = total
+        self.status = PENDING
+        self.results = []
+        self.error = None
+        self.steps = None
+        self.submitted = time.time()
+        self.started = None
+        self.finished_at = None
+        self._event = threading.Event()
+
+    @property
+    def done(self):
+        return len(self.results)
+
+    @property
+    def finished(self):
+        return self.status in (DONE, ERROR)
+
+    @property
+    def progress(self):
+        if self.status == DONE:
+            return 1.0
+        done, total = self.steps or (self.done, self.total)
+        return min(done / total, 1.0) if total else 0.0
+
+    @property
+    def result(self):
+        """The single result of a one-item job (``None`` until it is done)."""
+        return self.results[0] if self.status == DONE and self.results else None
+
+    def wait(self, timeout=None):
+        """Block until the job has finished; returns whether it did."""
+        return self._event.wait(timeout)
+
+    def _run(self, iterate):
+        self.status, self.started = RUNNING, time.time()
+        try:
+            for result in iterate():
+                self.results.append(result)
+            self.status = DONE
+        except Exception as exc:
+            self.error = f"{type(exc).__name__}: {exc}"
+            self.status = ERROR
+        finally:
+            self.finished_at = time.time()
+            self._event.set()
+            _prune()
+
+
+def job_id(key):
+    """Stable ID of a request key (any JSON-serialisable value)."""
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _prune():
+    with _lock:
+        finished = [jid for jid, job in _jobs.items() if job.finished]
+        for jid in finished[:max(0, len(finished) - MAX_FINISHED)]:
+            del _jobs[jid]
+
+
+def get(jid):
+    """The job with ID ``jid``, or ``None`` when unknown (or pruned)."""
+    with _lock:
+        return _jobs.get(jid)
+
+
+def submit(key, iterate, total=1, label=""):
+    """Run ``iterate()`` (an iterable of results) in the background, once per ``key``.
+
+    Returns the new job, or the existing one for the same ``key`` unless that
+    one failed.
+    """
+    jid = job_id(key)
+    with _lock:
+        job = _jobs.get(jid)
+        if job is not None and job.status != ERROR:
+            return job
+        job = _jobs[jid] = Job(jid, label, total)
+    threading.Thread(target=job._run, args=(iterate,), name=f"job-{jid}", daemon=True).start()
+    return job
+
+
+def submit_pool(key, fn, item, label="", max_workers=None):
+    """Submit ``fn(item)`` as a one-item job that runs in a worker process."""
+    return submit(key, lambda: [workers.get_executor(max_workers).submit(fn, item).result()], 1, label)
+
+
+def submit_steps(key, fn, label=""):
+    """Submit ``fn(progress)`` as a one-item job run by the job thread itself.
+
+    For work that spreads over the process pool on its own (order searches,
+    backtests): ``progress(done, total)`` moves the job's progress bar.
+    """
+    jid = job_id(key)
+
+    def report(done, total):
+        job = get(jid)
+        if job is not None:
+            job.steps = (done, total)
+
+    return submit(key, lambda: [fn(report)], 1, label)
+
+
+def session_job(name, submit_fn, key, *args, **kwargs):
+    """The job for ``key`` remembered under ``st.session_state[name]``, else ``submit_fn(key, ...)``'s.
+
+    Pop ``name`` from the session to submit a failed request again.
+    """
+    import streamlit as st
+
+    job = get(st.session_state[name]) if st.session_state.get(name) == job_id(key) else None
+    if job is None:
+        job = submit_fn(key, *args, **kwargs)
+        st.session_state[name] = job.id
+    return job
+
+
+def watch(job, text, render=None):
+    """Show ``job``'s progress until it finishes; returns ``True`` once it has.
+
+    While the job runs, a small fragment polls it every ``POLL_SECONDS`` and
+    reruns the app when it finishes, so the results appear without a click.
+    ``render(results)``, if given, is called on every poll with the results
+    produced so far, so they appear one by one.
+    """
+    import streamlit as st
+
+    if job.finished:
+        return True
+
+    @st.fragment(run_every=POLL_SECONDS, key=f"job-{job.id}")
+    def _status():
+        if job.finished:
+            st.rerun()
+        elapsed = time.time() - (job.started or job.submitted)
+        done, total = job.steps or (job.done, job.total)
+        st.progress(job.progress, text=f"{text}: {done}/{total} selesai ({elapsed:.0f} detik)")
+        if render is not None:
+            render(list(job.results))
+
+    _status()
+    return False
@@ -0,0 +1,121 @@
+"""SARIMAX fitting and forecasting helpers that can run in worker processes."""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from forecasting import artifacts
+
+PRODUCT_ORDER = (1, 0, 1)
+PRODUCT_SEASONAL_ORDER = (1, 0, 1, 52)
+PRODUCT_STEPS = 52
+
+# Mode musiman ringkas: siklus tahunan mingguan sebagai regresor Fourier
+WEEKS_PER_YEAR = 365.25 / 7
+FOURIER_HARMONICS = 4
+
+
+def fourier_terms(start, n, period=WEEKS_PER_YEAR, harmonics=FOURIER_HARMONICS):
+    """Sine/cosine regressors for time steps ``start .. start + n - 1``."""
+    t = np.arange(start, start + n)[:, None]
+    k = np.arange(1, harmonics + 1)[None, :]
+    angle = 2 * np.pi * k * t / period
+    return np.hstack([np.sin(angle), np.cos(angle)])
+
+
+def _fit_forecast(product_data_resampled, steps, order, seasonal_order, **kwargs):
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    started = time.perf_counter()
+    exog = kwargs.pop('exog', None)
+    future_exog = kwargs.pop('future_exog', None)
+    model = SARIMAX(product_data_resampled,
+                    exog=exog,
+                    order=order,
+                    seasonal_order=seasonal_order,
+                    enforce_stationarity=False,
+                    enforce_invertibility=False,
+                    **kwargs)
+    results = model.fit(disp=False)
+    diagnostics = {
+        'aic': float(results.aic),
+        'bic': float(results.bic),
+        'converged': bool(results.mle_retvals.get('converged', True)) if results.mle_retvals else True,
+        'fit_seconds': time.perf_counter() - started,
+    }
+
+    forecast_object = results.get_forecast(steps=steps, exog=future_exog)
+    forecast_values = forecast_object.predicted_mean
+    forecast_ci = forecast_object.conf_int()
+
+    if not isinstance(forecast_values.index, pd.DatetimeIndex):
+        last_date = product_data_resampled.index[-1]
+        forecast_values.index = pd.date_range(start=last_date + pd.Timedelta(weeks=1), periods=steps, freq='W')
+        forecast_ci.index = forecast_values.index
+    return forecast_values.clip(lower=0), forecast_ci.clip(lower=0), diagnostics
+
+
+def fit_sarima(item):
+    """Fit ``(series, order, seasonal_order)`` and return it as a compact, picklable model."""
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    series, order, seasonal_order = item
+    results = SARIMAX(series,
+                      order=order,
+                      seasonal_order=seasonal_order,
+                      enforce_stationarity=False,
+                      enforce_invertibility=False).fit(disp=False)
+    return artifacts.from_results(results)
+
+
+def forecast_product(item):
+    """Fit the weekly product model and forecast ``steps`` weeks ahead.
+
+    ``item`` is ``(product, series, steps)`` optionally followed by
+    ``(order, seasonal_order)``; the default is the product spec above.  Only
+    the (picklable) forecast frames and fit diagnostics are returned so the
+    fitted results never cross process boundaries.
+    """
+    product, product_data_resampled, steps = item[:3]
+    order, seasonal_order = item[3:5] if len(item) > 3 else (PRODUCT_ORDER, PRODUCT_SEASONAL_ORDER)
+    forecast_values, forecast_ci, diagnostics = _fit_forecast(product_data_resampled, steps, order, seasonal_order)
+    return {
+        'product': product,
+        'order': tuple(order),
+        'seasonal_order': tuple(seasonal_order),
+        'forecast': forecast_values,
+        'conf_int': forecast_ci,
+        **diagnostics,
+    }
+
+
+def forecast_product_fourier(item):
+    """Like :func:`forecast_product`, but with Fourier terms instead of ``s=52``.
+
+    The yearly cycle is carried by ``2 * FOURIER_HARMONICS`` regressors and a
+    constant, so the state vector holds only the low-order ARMA part instead
+    of more than a hundred seasonal lags.  A seasonal order in ``item`` is
+    ignored.
+    """
+    product, product_data_resampled, steps = item[:3]
+    order = item[3] if len(item) > 3 else PRODUCT_ORDER
+    n = len(product_data_resampled)
+    forecast_values, forecast_ci, diagnostics = _fit_forecast(
+        product_data_resampled, steps, order, (0, 0, 0, 0),
+        exog=fourier_terms(0, n), future_exog=fourier_terms(n, steps), trend='c'
+    )
+    return {
+        'product': product,
+        'order': tuple(order),
+        'seasonal_order': (0, 0, 0, 0),
+        'forecast': forecast_values,
+        'conf_int': forecast_ci,
+        **diagnostics,
+    }
+
+
+FORECASTERS = {
+    'sarima': forecast_product,
+    'fourier': forecast_product_fourier,
+}
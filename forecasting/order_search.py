@@ -0,0 +1,194 @@
+"""Automatic SARIMA order selection over a candidate grid.
+
+Likelihoods of differently differenced series are not comparable, so the
+differencing orders are decided first -- ``d`` from an ADF test, ``D`` from
+the strength of the seasonal component -- and the information criterion
+only ranks the ARMA orders ``p``, ``q``, ``P`` and ``Q``.
+
+Candidates are fitted in parallel on the shared process pool in two rounds:
+a cheap round with few optimizer iterations drops candidates that fail or
+trail the leader by more than ``margin`` information-criterion points, then
+the survivors are refitted to convergence and ranked.  The ranking is cached
+per ``(series hash, grid, criterion, regressors)`` in memory and on disk.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import uuid
+import warnings
+
+import numpy as np
+
+from forecasting import workers
+from forecasting.cache import LRUCache, cache_dir, prune_dir
+
+SCREEN_MAXITER = 15
+FULL_MAXITER = 50
+MARGIN = 10.0
+ADF_ALPHA = 0.05
+# Ambang kekuatan musiman untuk differencing musiman (seperti nsdiffs pada paket forecast R)
+SEASONAL_STRENGTH = 0.64
+MAX_DISK_ENTRIES = 256
+
+_rankings = LRUCache(64)
+
+
+def candidate_grid(p=(0, 1, 2), q=(0, 1, 2), P=(0, 1), Q=(0, 1), s=12, d=0, D=0):
+    """All ``(order, seasonal_order)`` combinations of the ARMA orders for fixed ``d``/``D``."""
+    grid = []
+    for p_, q_, P_, Q_ in itertools.product(p, q, P, Q):
+        seasonal = (P_, D, Q_, s) if (P_ or D or Q_) else (0, 0, 0, 0)
+        candidate = ((p_, d, q_), seasonal)
+        if candidate not in grid:
+            grid.append(candidate)
+    return grid
+
+
+def seasonal_strength(values, s):
+    """``max(0, 1 - var(remainder) / var(seasonal + remainder))`` of an additive decomposition."""
+    from statsmodels.tsa.seasonal import seasonal_decompose
+
+    values = np.asarray(values, dtype=float)
+    if s < 2 or len(values) < 2 * s:
+        return 0.0
+    parts = seasonal_decompose(values, period=s, two_sided=True)
+    remainder = parts.resid[np.isfinite(parts.resid)]
+    detrended = (parts.seasonal + parts.resid)[np.isfinite(parts.resid)]
+    if detrended.var() == 0:
+        return 0.0
+    return float(max(0.0, 1.0 - remainder.var() / detrended.var()))
+
+
+def select_differencing(values, s=12):
+    """``(d, D)``: ``d = 1`` when ADF does not reject a unit root, ``D = 1`` for a strong seasonal cycle."""
+    from statsmodels.tsa.stattools import adfuller
+
+    values = np.asarray(values, dtype=float)
+    values = values[np.isfinite(values)]
+    D = int(seasonal_strength(values, s) >= SEASONAL_STRENGTH)
+    if D:
+        values = values[s:] - values[:-s]
+    d = int(len(values) > 10 and adfuller(values)[1] > ADF_ALPHA)
+    return d, D
+
+
+def differencing_grid(series, s=12, **orders):
+    """:func:`candidate_grid` with ``d``/``D`` chosen by :func:`select_differencing`."""
+    d, D = select_differencing(series, s)
+    return candidate_grid(s=s, d=d, D=D, **orders)
+
+
+def _fit_candidate(item):
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    values, order, seasonal_order, maxiter, exog, trend = item
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = SARIMAX(values, exog=exog, order=order, seasonal_order=seasonal_order, trend=trend,
+                              enforce_stationarity=False, enforce_invertibility=False).fit(disp=False, maxiter=maxiter)
+    except Exception:
+        return None
+    if not (np.isfinite(results.aic) and np.isfinite(results.bic)):
+        return None
+    return {
+        "order": list(order),
+        "seasonal_order": list(seasonal_order),
+        "aic": float(results.aic),
+        "bic": float(results.bic),
+        "converged": bool(results.mle_retvals.get("converged", True)) if results.mle_retvals else True,
+    }
+
+
+def _run_round(values, candidates, maxiter, max_workers, progress, offset, total, exog=None, trend=None):
+    items = [(values, order, seasonal_order, maxiter, exog, trend) for order, seasonal_order in candidates]
+    fitted = []
+    results = workers.imap_unordered(_fit_candidate, items, max_workers, force_pool=True)
+    for done, (_, result) in enumerate(results, 1):
+        if result is not None:
+            fitted.append(result)
+        if progress is not None:
+            progress(offset + done, total)
+    return fitted
+
+
+def _cache_key(values, grid, criterion, exog, trend):
+    digest = hashlib.sha256(np.ascontiguousarray(values, dtype=float).tobytes())
+    digest.update(json.dumps([grid, criterion, trend]).encode())
+    if exog is not None:
+        digest.update(np.ascontiguousarray(exog, dtype=float).tobytes())
+    return digest.hexdigest()
+
+
+def _read_ranking(path):
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _write_ranking(path, ranking):
+    # Tulis ke file sementara lalu rename atomik, agar sesi lain tidak membaca JSON setengah jadi
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+    tmp.write_text(json.dumps(ranking))
+    os.replace(tmp, path)
+    prune_dir(path.parent, MAX_DISK_ENTRIES)
+
+
+def search_orders(series, grid=None, criterion="aic", max_workers=None, margin=MARGIN, progress=None,
+                  exog=None, trend=None):
+    """Rank the candidates in ``grid`` for ``series`` by ``criterion`` (``"aic"`` or ``"bic"``).
+
+    Every candidate must share the same ``d`` and ``D``; the default grid
+    takes them from :func:`select_differencing`.  ``exog`` and ``trend`` are
+    passed to every candidate, so regressors the final model uses (Fourier
+    terms, a constant) are part of the comparison.
+
+    Returns a list of dicts (``order``, ``seasonal_order``, ``aic``, ``bic``,
+    ``converged``), best first.  ``progress(done, total)`` is called as
+    candidate fits complete.
+    """
+    values = np.asarray(series, dtype=float)
+    if exog is not None:
+        exog = np.asarray(exog, dtype=float)[np.isfinite(values)]
+    values = values[np.isfinite(values)]
+    grid = [(tuple(order), tuple(seasonal_order))
+            for order, seasonal_order in (grid or differencing_grid(values))]
+    if len({(order[1], seasonal_order[1]) for order, seasonal_order in grid}) > 1:
+        raise ValueError("All candidates must share d and D; likelihoods of different differencing are not comparable")
+    key = _cache_key(values, grid, criterion, exog, trend)
+
+    ranking = _rankings.get(key)
+    if ranking is not None:
+        return ranking
+    disk_path = cache_dir("orders") / f"{key}.json"
+    ranking = _read_ranking(disk_path) if disk_path.exists() else None
+    if ranking is not None:
+        _rankings.put(key, ranking)
+        return ranking
+
+    # Putaran 1: fit singkat untuk membuang kandidat gagal atau jelas kalah
+    screened = _run_round(values, grid, SCREEN_MAXITER, max_workers, progress, 0, 2 * len(grid), exog, trend)
+    if not screened:
+        return []
+    leader = min(result[criterion] for result in screened)
+    survivors = [(tuple(r["order"]), tuple(r["seasonal_order"])) for r in screened if r[criterion] <= leader + margin]
+
+    # Putaran 2: fit penuh untuk kandidat yang tersisa
+    total = len(grid) + len(survivors)
+    ranking = _run_round(values, survivors, FULL_MAXITER, max_workers, progress, len(grid), total, exog, trend)
+    ranking.sort(key=lambda result: (not result["converged"], result[criterion]))
+
+    _write_ranking(disk_path, ranking)
+    _rankings.put(key, ranking)
+    return ranking
+
+
+def best_order(series, grid=None, criterion="aic", max_workers=None, progress=None, exog=None, trend=None):
+    """``(order, seasonal_order)`` of the best candidate, or ``None`` if every fit failed."""
+    ranking = search_orders(series, grid, criterion, max_workers, progress=progress, exog=exog, trend=trend)
+    if not ranking:
+        return None
+    return tuple(ranking[0]["order"]), tuple(ranking[0]["seasonal_order"])
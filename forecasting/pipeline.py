@@ -0,0 +1,199 @@
+"""Headless forecasting pipeline shared by the batch CLI and the pages.
+
+``run_batch`` takes a transactions file, forecasts every product that passes
+ADF screening plus the log-scale total, and writes the results as Parquet to
+a directory keyed by the file's content digest (``.cache/batch/<digest>``
+by default).  The pages look that directory up for the uploaded file and use
+the precomputed forecasts instead of fitting on the script thread.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from forecasting import artifacts, backtest, cube, forecasts, ingest, intermittent, models, screening, store, update, workers
+from forecasting.cache import cache_dir
+
+TOTAL_ORDER = (1, 1, 1)
+TOTAL_SEASONAL_ORDER = (1, 1, 1, 12)
+TOTAL_STEPS = 12
+
+PRODUCT_FORECASTS = "product_forecasts.parquet"
+TOTAL_FORECAST = "total_forecast.parquet"
+DIAGNOSTICS = "diagnostics.parquet"
+META = "meta.json"
+
+
+def results_dir(digest):
+    return cache_dir("batch") / digest
+
+
+def forecast_total(total_df, steps=TOTAL_STEPS, model_path=None,
+                   order=TOTAL_ORDER, seasonal_order=TOTAL_SEASONAL_ORDER):
+    """Forecast the cleaned Total-page frame on the log scale, as the Total page does.
+
+    With ``model_path`` the stored model is loaded and brought up to date
+    with :func:`forecasting.update.update_model`; otherwise a SARIMAX with
+    ``order``/``seasonal_order`` is fitted on ``Jumlah_Log`` through the
+    shared model store (so the pages reuse it, and vice versa).
+    """
+    if model_path is not None:
+        model_fit, _, _ = update.update_model(artifacts.load_model(model_path), total_df["Jumlah_Log"])
+    else:
+        key, _ = store.train_sarima((total_df["Jumlah_Log"], order, seasonal_order))
+        model_fit = store.get(key)
+
+    horizon = forecasts.total_forecast(model_fit, total_df["Jumlah_Log"], max(steps, forecasts.MAX_TOTAL_STEPS))
+    return horizon.frame(steps)
+
+
+def _forecast_safe(item):
+    engine, product_item = item
+    try:
+        return models.FORECASTERS[engine](product_item)
+    except Exception as exc:
+        return {'product': product_item[0], 'error': f"{type(exc).__name__}: {exc}"}
+
+
+def forecast_products(products_df, engine='sarima', steps=models.PRODUCT_STEPS, max_workers=None, progress=None,
+                      key=None, intermittent_method='sba'):
+    """Screen and forecast every product in the cleaned Product-page frame.
+
+    Returns ``(forecasts, diagnostics)``: a long table with one row per
+    product and week (``Nama Barang``, ``Minggu``, ``Prediksi``, ``Batas
+    Bawah``, ``Batas Atas``) and one diagnostics row per product.  ``key``
+    caches the aggregate cube the weekly series come from.  Products that
+    fail screening are forecast with ``intermittent_method`` (see
+    :mod:`forecasting.intermittent`), or left out when it is ``None``.
+    """
+    weekly = cube.aggregate_cube(products_df, key=key).matrix("W")
+    adf_pass, adf_fail, insufficient = screening.screen_products(weekly, max_workers=max_workers)
+
+    diagnostics = [{'Nama Barang': p, 'status': 'adf_fail'} for p in adf_fail]
+    diagnostics += [{'Nama Barang': p, 'status': 'insufficient_data'} for p in insufficient]
+    frames = []
+    if intermittent_method is not None:
+        for row in diagnostics:
+            row['method'] = intermittent_method
+        frames.append(intermittent.forecast_products(weekly, adf_fail + insufficient, steps, intermittent_method))
+    items = [(engine, (product, weekly.series(product), steps)) for product in adf_pass]
+    for done, (_, result) in enumerate(workers.imap_unordered(_forecast_safe, items, max_workers), 1):
+        if progress is not None:
+            progress(done, len(items))
+        if 'error' in result:
+            diagnostics.append({'Nama Barang': result['product'], 'status': 'error', 'error': result['error']})
+            continue
+        diagnostics.append({
+            'Nama Barang': result['product'],
+            'status': 'forecast',
+            'method': engine,
+            'order': str(result['order']),
+            'seasonal_order': str(result['seasonal_order']),
+            'aic': result['aic'],
+            'bic': result['bic'],
+            'converged': result['converged'],
+            'fit_seconds': result['fit_seconds'],
+        })
+        frames.append(pd.DataFrame({
+            'Nama Barang': result['product'],
+            'Minggu': result['forecast'].index,
+            'Prediksi': result['forecast'].to_numpy(),
+            'Batas Bawah': result['conf_int'].iloc[:, 0].to_numpy(),
+            'Batas Atas': result['conf_int'].iloc[:, 1].to_numpy(),
+        }))
+
+    frames = [frame for frame in frames if len(frame)]
+    forecasts = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(
+        columns=['Nama Barang', 'Minggu', 'Prediksi', 'Batas Bawah', 'Batas Atas']
+    )
+    return forecasts, pd.DataFrame(diagnostics)
+
+
+def run_batch(path, out_dir=None, engine='sarima', max_workers=None, total_model=None,
+              total_steps=TOTAL_STEPS, product_steps=models.PRODUCT_STEPS, log=print, intermittent_method='sba'):
+    """Forecast all products and the total for the transactions file at ``path``."""
+    data = Path(path).read_bytes()
+    digest = ingest.file_digest(data)
+    out_dir = Path(out_dir) if out_dir else results_dir(digest)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    raw = ingest.load_frame(data)
+    meta = {'source': str(path), 'digest': digest, 'engine': engine, 'intermittent': intermittent_method,
+            'created': pd.Timestamp.now().isoformat()}
+
+    if {'Jumlah', 'Nama Barang', 'Tanggal'}.issubset(raw.columns):
+        log("Meramalkan per produk...")
+        forecasts, diagnostics = forecast_products(
+            ingest.load_frame(data, "produk"), engine, product_steps, max_workers,
+            progress=lambda done, total: log(f"  {done}/{total} produk selesai"),
+            key=(digest, "produk"), intermittent_method=intermittent_method,
+        )
+        forecasts.to_parquet(out_dir / PRODUCT_FORECASTS, index=False)
+        diagnostics.to_parquet(out_dir / DIAGNOSTICS, index=False)
+        meta['products'] = diagnostics['status'].value_counts().to_dict() if len(diagnostics) else {}
+
+    if {'Jumlah', 'Tanggal'}.issubset(raw.columns):
+        log("Meramalkan total...")
+        forecast_total(ingest.load_frame(data, "total"), total_steps, total_model).to_parquet(
+            out_dir / TOTAL_FORECAST, index=False
+        )
+
+    meta['seconds'] = time.perf_counter() - started
+    (out_dir / META).write_text(json.dumps(meta, indent=2, default=str))
+    log(f"Hasil ditulis ke {out_dir} ({meta['seconds']:.1f} detik)")
+    return out_dir
+
+
+def run_backtest(path, model_paths=(), horizon=backtest.HORIZON, products=False, max_workers=None, log=print):
+    """Rolling-origin accuracy of stored Total models (and optionally the product spec) on a file.
+
+    Returns ``(metrics, errors)``: per-horizon MAPE/RMSE/MASE rows labelled
+    ``Model`` (the stored model's path, or ``produk:<name>``).
+    """
+    data = Path(path).read_bytes()
+    digest = ingest.file_digest(data)
+    frames, errors = [], []
+
+    if model_paths:
+        total_df = ingest.load_frame(data, "total")
+        for model_path in model_paths:
+            log(f"Backtest model {model_path}...")
+            model = artifacts.load_model(model_path)
+            results = backtest.run_backtests({str(model_path): total_df["Jumlah_Log"]}, model.spec["init_kwds"],
+                                             model.params.to_numpy(), horizon, log_scale=True, max_workers=max_workers)
+            metrics, failed = backtest.summary(results, "Model")
+            frames.append(metrics)
+            errors.append(failed)
+
+    if products:
+        log("Backtest per produk (parameter di-fit sekali per produk)...")
+        weekly = cube.aggregate_cube(ingest.load_frame(data, "produk"), key=(digest, "produk")).matrix("W")
+        adf_pass, _, _ = screening.screen_products(weekly, max_workers=max_workers)
+        results = backtest.run_backtests(
+            {f"produk:{product}": weekly.series(product) for product in adf_pass},
+            dict(order=models.PRODUCT_ORDER, seasonal_order=models.PRODUCT_SEASONAL_ORDER,
+                 enforce_stationarity=False, enforce_invertibility=False),
+            horizon=horizon, max_workers=max_workers,
+            progress=lambda done, total: log(f"  {done}/{total} potongan origin selesai"),
+        )
+        metrics, failed = backtest.summary(results, "Model")
+        frames.append(metrics)
+        errors.append(failed)
+
+    metrics = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return metrics, (pd.concat(errors, ignore_index=True) if errors else pd.DataFrame())
+
+
+def load_results(digest):
+    """Precomputed batch results for an upload, or ``None`` when there are none."""
+    out_dir = results_dir(digest)
+    if not (out_dir / META).exists():
+        return None
+    results = {'meta': json.loads((out_dir / META).read_text())}
+    for name, file_name in (('products', PRODUCT_FORECASTS), ('total', TOTAL_FORECAST), ('diagnostics', DIAGNOSTICS)):
+        if (out_dir / file_name).exists():
+            results[name] = pd.read_parquet(out_dir / file_name)
+    return results
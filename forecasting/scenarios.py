@@ -0,0 +1,110 @@
+"""Monte Carlo demand scenarios from a fitted SARIMAX state space model.
+
+A SARIMAX model is linear Gaussian in its state space form::
+
+    y_t     = d + Z a_t + e_t,        e_t ~ N(0, H)
+    a_{t+1} = c + T a_t + R n_t,      n_t ~ N(0, Q)
+
+Starting from the model's predicted state for the first forecast step (and
+its covariance), with the system matrices of every horizon step (a time
+trend makes the intercepts vary), every path is simulated at once: the state is a
+``(k_states, n_paths)`` matrix, so a horizon of ``h`` steps is ``h`` matrix
+products regardless of the number of paths.  The sample mean and variance
+per step converge to ``get_forecast``'s.
+
+The Total page models ``log1p(Jumlah)``; simulated values are transformed
+back with ``expm1`` path by path (and floored at zero), so quantiles and
+horizon totals are those of the demand itself, not of the log forecast.
+"""
+
+import numpy as np
+import pandas as pd
+
+N_PATHS = 10_000
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+
+def _matrix(ssm, name, steps):
+    """``ssm[name]`` with a trailing time axis of length ``steps`` (time-invariant ones broadcast)."""
+    value = np.asarray(ssm[name], dtype=float)
+    if value.ndim == (1 if name.endswith("intercept") else 2):
+        value = value[..., None]
+    if value.shape[-1] not in (1, steps):
+        raise ValueError(f"{name} has {value.shape[-1]} time points, expected 1 or {steps}")
+    return np.broadcast_to(value, value.shape[:-1] + (steps,))
+
+
+def _sqrt_psd(cov):
+    """Matrix square root of a covariance that may be singular (differencing states)."""
+    values, vectors = np.linalg.eigh(np.atleast_2d(cov))
+    return vectors * np.sqrt(np.clip(values, 0, None))
+
+
+def simulate_paths(model, steps, n_paths=N_PATHS, seed=None):
+    """``(n_paths, steps)`` simulated observations on the model's own scale.
+
+    ``model`` is a :class:`forecasting.artifacts.CompactSARIMA` (its state is
+    the predicted state for the first forecast step).
+    """
+    rng = np.random.default_rng(seed)
+    # Model sepanjang horizon, agar matriks yang berubah per waktu (mis. tren waktu) diambil per langkah
+    horizon = model._model(pd.Series(np.full(steps, np.nan)))
+    horizon.update(model.params.values)
+    ssm = horizon.ssm
+    design, obs_intercept, obs_cov = (_matrix(ssm, name, steps) for name in ("design", "obs_intercept", "obs_cov"))
+    transition, state_intercept = _matrix(ssm, "transition", steps), _matrix(ssm, "state_intercept", steps)
+    selection, state_cov = _matrix(ssm, "selection", steps), _matrix(ssm, "state_cov", steps)
+
+    k_states = transition.shape[0]
+    state = np.asarray(model.state, dtype=float)[:, None] + _sqrt_psd(model.state_cov) @ rng.standard_normal(
+        (k_states, n_paths)
+    )
+
+    paths = np.empty((steps, n_paths))
+    for step in range(steps):
+        obs_shock = _sqrt_psd(obs_cov[..., step])
+        state_shock = selection[..., step] @ _sqrt_psd(state_cov[..., step])
+        paths[step] = (
+            obs_intercept[0, step] + design[0, :, step] @ state
+            + obs_shock[0] @ rng.standard_normal((obs_shock.shape[1], n_paths))
+        )
+        state = (transition[..., step] @ state + state_intercept[:, step, None]
+                 + state_shock @ rng.standard_normal((state_shock.shape[1], n_paths)))
+    return paths.T
+
+
+class DemandScenarios:
+    """Simulated demand paths with quantiles, stock-out risk and safety stock."""
+
+    def __init__(self, index, demand):
+        self.index = index
+        self.demand = demand
+
+    @classmethod
+    def from_model(cls, model, index, n_paths=N_PATHS, seed=None, log_scale=True):
+        """Simulate ``len(index)`` steps; ``log_scale`` back-transforms ``log1p`` values."""
+        paths = simulate_paths(model, len(index), n_paths, seed)
+        demand = np.expm1(paths) if log_scale else paths
+        return cls(index, np.clip(demand, 0, None))
+
+    @property
+    def totals(self):
+        """Total demand over the horizon, one value per path."""
+        return self.demand.sum(axis=1)
+
+    def quantiles(self, quantiles=QUANTILES):
+        """Per-step demand quantiles as a frame (one column per quantile)."""
+        values = np.quantile(self.demand, quantiles, axis=0)
+        return pd.DataFrame(values.T, index=self.index, columns=[f"P{round(q * 100)}" for q in quantiles])
+
+    def stockout_probability(self, stock):
+        """Probability that demand over the horizon exceeds ``stock``."""
+        return float(np.mean(self.totals > stock))
+
+    def reorder_level(self, service_level):
+        """Stock that covers the horizon's demand with probability ``service_level``."""
+        return float(np.quantile(self.totals, service_level))
+
+    def safety_stock(self, service_level):
+        """Stock above the expected horizon demand needed for ``service_level``."""
+        return max(self.reorder_level(service_level) - float(self.totals.mean()), 0.0)
@@ -0,0 +1,72 @@
+"""ADF stationarity screening for every product's weekly series.
+
+P-values are memoised per ``(product, series hash)``, so a rerun or a new
+upload only re-tests products whose weekly data actually changed.  Pending
+tests are fanned out over the shared process pool in chunks.
+"""
+
+import hashlib
+
+import numpy as np
+
+from forecasting import workers
+from forecasting.cache import LRUCache
+
+MIN_WEEKS = 10
+ALPHA = 0.05
+
+_pvalues = LRUCache(50000)
+
+
+def series_hash(values):
+    values = np.ascontiguousarray(values)
+    return hashlib.blake2b(values.tobytes() + str(values.dtype).encode(), digest_size=16).hexdigest()
+
+
+def _adf_pvalues(chunk):
+    from statsmodels.tsa.stattools import adfuller
+    return [adfuller(values)[1] for values in chunk]
+
+
+def screen_products(weekly, max_workers=None, progress=None):
+    """Split ``weekly.products`` into ADF pass, fail and insufficient-data lists.
+
+    ``progress`` is called as ``progress(done, total)`` while tests complete.
+    """
+    adf_pass, adf_fail, insufficient = [], [], []
+    pvalues = {}
+    pending = []
+
+    for product in weekly.products:
+        values = weekly.series(product).to_numpy()
+        if len(values) <= MIN_WEEKS:
+            continue
+        key = (product, series_hash(values))
+        cached = _pvalues.get(key)
+        if cached is None:
+            pending.append((key, values))
+        else:
+            pvalues[product] = cached
+
+    total, done = len(pending), 0
+    if progress is not None:
+        progress(done, total)
+    if pending:
+        n = max_workers or workers.DEFAULT_WORKERS
+        chunks = workers.chunked(pending, n * 4)
+        for i, chunk_pvalues in workers.imap_unordered(_adf_pvalues, [[v for _, v in c] for c in chunks], n):
+            for (key, _), pvalue in zip(chunks[i], chunk_pvalues):
+                _pvalues.put(key, pvalue)
+                pvalues[key[0]] = pvalue
+            done += len(chunks[i])
+            if progress is not None:
+                progress(done, total)
+
+    for product in weekly.products:
+        if product not in pvalues:
+            insufficient.append(product)
+        elif pvalues[product] <= ALPHA:
+            adf_pass.append(product)
+        else:
+            adf_fail.append(product)
+    return adf_pass, adf_fail, insufficient
@@ -0,0 +1,99 @@
+"""Per-product period series built in a single grouped pass.
+
+Filtering the transaction frame once per product and resampling each slice
+is O(rows x products).  ``PeriodMatrix`` instead bins every transaction into
+a dense product x period NumPy array with one ``bincount`` call; each
+product's series is then a zero-copy slice of its row.  Periods are days,
+weeks ending Sunday, months or quarters, labelled like ``resample`` labels
+them (the period's last day).
+"""
+
+import numpy as np
+import pandas as pd
+
+# Frekuensi periode -> (frekuensi Period, frekuensi label seperti resample)
+FREQUENCIES = {
+    'D': ('D', 'D'),
+    'W': ('W-SUN', 'W-SUN'),
+    'M': ('M', pd.offsets.MonthEnd()),
+    'Q': ('Q-DEC', pd.offsets.QuarterEnd(startingMonth=12)),
+}
+
+
+class PeriodMatrix:
+    """Per-period totals for every product, stored row-per-product."""
+
+    def __init__(self, products, index, values, first, last):
+        self.products = products
+        self.index = index
+        self.values = values
+        self.first = first
+        self.last = last
+        self._rows = {name: i for i, name in enumerate(products)}
+
+    @classmethod
+    def from_frame(cls, df, product_col='Nama Barang', date_col='Tanggal', value_col='Jumlah', freq='W'):
+        """Bin ``df`` by product and period; ``freq`` is one of ``FREQUENCIES``.
+
+        ``product_col=None`` gives a single row (named ``"Total"``) and the
+        dates may come from the index when ``date_col`` is not a column.
+        """
+        period_freq, label_freq = FREQUENCIES[freq]
+        dates = pd.DatetimeIndex(df[date_col] if date_col in df.columns else df.index)
+        if product_col is None:
+            codes, products = np.zeros(len(df), dtype=np.intp), np.array(['Total'], dtype=object)
+        else:
+            codes, products = pd.factorize(df[product_col], sort=False)
+            products = np.asarray(products)
+
+        if len(dates) == 0:
+            index = pd.DatetimeIndex([], freq=label_freq, name=date_col)
+            values = np.zeros((len(products), 0))
+            empty = np.zeros(len(products), dtype=np.intp)
+            return cls(pd.Index(products, name=product_col), index, values, empty, empty)
+
+        # Nomor urut periode setiap tanggal (minggu berakhir hari Minggu, seperti resample('W'))
+        periods = dates.to_period(period_freq)
+        start = periods.min()
+        period_pos = periods.asi8 - start.ordinal
+        n_products, n_periods = len(products), int(period_pos.max()) + 1
+
+        amounts = df[value_col].to_numpy()
+        flat = np.bincount(codes * n_periods + period_pos, weights=amounts, minlength=n_products * n_periods)
+        values = flat.reshape(n_products, n_periods)
+        if np.issubdtype(amounts.dtype, np.integer):
+            # Total per periode bisa melampaui dtype sempit per transaksi
+            values = values.astype(np.int64)
+        values = np.ascontiguousarray(values)
+
+        first = np.full(n_products, n_periods, dtype=np.intp)
+        last = np.full(n_products, -1, dtype=np.intp)
+        np.minimum.at(first, codes, period_pos)
+        np.maximum.at(last, codes, period_pos)
+
+        start_label = start.end_time.normalize()
+        index = pd.date_range(start_label, periods=n_periods, freq=label_freq, name=date_col)
+        return cls(pd.Index(products, name=product_col), index, values, first, last)
+
+    def __len__(self):
+        return len(self.products)
+
+    def __contains__(self, product):
+        return product in self._rows
+
+    def row(self, product):
+        return self._rows[product]
+
+    def lengths(self):
+        """Number of periods between each product's first and last transaction."""
+        return np.maximum(self.last - self.first + 1, 0)
+
+    def series(self, product):
+        """Series for ``product``, identical to ``resample(freq).sum()`` on its rows."""
+        i = self._rows[product]
+        lo, hi = self.first[i], self.last[i] + 1
+        return pd.Series(self.values[i, lo:hi], index=self.index[lo:hi], name='Jumlah')
+
+
+# Nama lama, dipakai untuk matriks mingguan
+WeeklyMatrix = PeriodMatrix
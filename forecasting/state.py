@@ -0,0 +1,78 @@
+"""Per-session memoisation for page fragments.
+
+Streamlit reruns the whole script on a widget change outside a fragment.
+Upstream results (charts' aggregates, test statistics) are stored in
+``st.session_state`` keyed by the upload's digest, so such reruns reuse them
+instead of recomputing.
+
+:func:`footprint` reports how much memory the objects a session holds (its
+memoised values plus frames registered with :func:`track`) take up.
+"""
+
+import sys
+import weakref
+
+import numpy as np
+
+
+def memo(name, key, compute):
+    """Return ``compute()`` for ``key``, reusing the session's previous value for ``name``."""
+    import streamlit as st
+
+    store = st.session_state.setdefault("_memo", {})
+    entry = store.get(name)
+    if entry is not None and entry[0] == key:
+        return entry[1]
+    value = compute()
+    store[name] = (key, value)
+    return value
+
+
+def track(name, obj):
+    """Count ``obj`` in this session's :func:`footprint` without keeping it alive."""
+    import streamlit as st
+
+    tracked = st.session_state.setdefault("_tracked", {})
+    try:
+        tracked[name] = weakref.ref(obj)
+    except TypeError:
+        tracked[name] = lambda: obj
+    return obj
+
+
+def nbytes(obj, _seen=None):
+    """Approximate memory of ``obj`` in bytes, counting shared objects once."""
+    import pandas as pd
+
+    seen = set() if _seen is None else _seen
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, (pd.Series, pd.Index)):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(nbytes(value, seen) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sum(nbytes(value, seen) for value in obj)
+    if hasattr(obj, "__dict__"):
+        return sys.getsizeof(obj) + nbytes(vars(obj), seen)
+    return sys.getsizeof(obj)
+
+
+def footprint():
+    """``{name: MB}`` for this session's memoised values and tracked objects."""
+    import streamlit as st
+
+    seen = set()
+    sizes = {}
+    for name, (_, value) in st.session_state.get("_memo", {}).items():
+        sizes[f"memo:{name}"] = nbytes(value, seen) / 2 ** 20
+    for name, ref in st.session_state.get("_tracked", {}).items():
+        obj = ref()
+        if obj is not None:
+            sizes[name] = nbytes(obj, seen) / 2 ** 20
+    return sizes
@@ -0,0 +1,260 @@
+"""Shared store of trained SARIMA models, safe for concurrent sessions.
+
+Models trained from an upload are stored under a content-addressed key --
+the hash of the training series and the model specification -- so any
+session (or the batch CLI) that trains the same specification on the same
+data finds the model instead of fitting again::
+
+    .cache/models/
+        <key>/          slim artifact (see forecasting.artifacts)
+        <key>.lock      lock file held while <key> is being trained
+
+Writes are atomic: an artifact is written to a temporary directory and
+renamed into place.  :func:`get_or_train` is single-flight: a per-key thread
+lock within a process and an exclusive file lock across processes (pool
+workers, several Streamlit servers) make N concurrent requests for the same
+key run one fit; the others wait and then load its result.  Loaded models
+are kept in a bounded process-wide LRU.
+
+The directory is bounded too: every hit touches the entry's modification
+time, and after each new artifact is written :func:`prune` removes the least
+recently used ones beyond ``MAX_DISK_ENTRIES``, lock files nobody holds, and
+temporary directories left behind by crashed writers.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import numpy as np
+
+from forecasting import artifacts
+from forecasting.cache import LRUCache, cache_dir
+from forecasting.screening import series_hash
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+MEMORY_MODELS = int(os.environ.get("PERAMALAN_MODEL_CACHE", "16"))
+MAX_DISK_ENTRIES = int(os.environ.get("PERAMALAN_MODEL_STORE", "128"))
+STALE_SECONDS = 3600
+
+_memory = LRUCache(MEMORY_MODELS)
+_locks_guard = threading.Lock()
+_locks = {}
+
+
+def root():
+    return cache_dir("models")
+
+
+def model_key(series, init_kwds):
+    """Content address of a model: training data (values and dates) plus specification."""
+    values = np.asarray(getattr(series, "values", series), dtype=float)
+    digest = hashlib.sha256(series_hash(values).encode())
+    index = getattr(series, "index", None)
+    if index is not None and hasattr(index, "asi8"):
+        digest.update(series_hash(index.asi8).encode())
+    init_kwds = {key: list(value) if isinstance(value, tuple) else value for key, value in dict(init_kwds).items()}
+    digest.update(json.dumps(init_kwds, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:32]
+
+
+def path_for(key):
+    return root() / key
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def get(key):
+    """The stored model for ``key`` (memory first, then disk), or ``None``."""
+    model = _memory.get(key)
+    if model is None and artifacts.is_artifact(path_for(key)):
+        try:
+            model = artifacts.load_model(path_for(key))
+        except OSError:
+            # Dihapus oleh prune di antara pengecekan dan pemuatan
+            return None
+        _memory.put(key, model)
+    if model is not None:
+        _touch(path_for(key))
+    return model
+
+
+def put(key, model):
+    """Atomically write ``model`` under ``key``; an existing artifact is kept as is."""
+    path = path_for(key)
+    if not artifacts.is_artifact(path):
+        model.save(path)
+        prune(keep=(key,))
+    _memory.put(key, model)
+    return path
+
+
+def _remove_dir(path):
+    # Rename dulu agar pembaca tidak pernah melihat artefak setengah terhapus
+    trash = path.with_name(f".{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.old")
+    try:
+        os.replace(path, trash)
+    except OSError:
+        return False
+    shutil.rmtree(trash, ignore_errors=True)
+    return True
+
+
+def _is_current(handle, path):
+    """Whether the open ``handle`` is still the file at ``path`` (not unlinked by :func:`prune`)."""
+    try:
+        return os.fstat(handle.fileno()).st_ino == os.stat(path).st_ino
+    except OSError:
+        return False
+
+
+def _remove_idle_lock(path):
+    """Delete the lock file ``path`` unless someone holds it (a fit is running).
+
+    Safe against :func:`_file_lock`: a process that opened the file before it
+    was unlinked notices the changed inode after locking and opens it again.
+    """
+    try:
+        with open(path, "a+b") as handle:
+            if not _lock(handle, blocking=False):
+                return
+            try:
+                if _is_current(handle, path):
+                    path.unlink()
+            finally:
+                _unlock(handle)
+    except OSError:
+        pass
+
+
+def prune(max_entries=None, keep=()):
+    """Remove the least recently used artifacts beyond ``max_entries`` (default ``MAX_DISK_ENTRIES``).
+
+    Keys in ``keep`` are never removed.  Also deletes idle lock files and
+    stale temporary directories.  Returns the number of artifacts removed.
+    """
+    max_entries = MAX_DISK_ENTRIES if max_entries is None else max_entries
+    base = root()
+    entries, stale = [], []
+    for path in base.iterdir():
+        if not path.is_dir():
+            continue
+        try:
+            mtime = path.stat().st_mtime
+        except OSError:
+            continue
+        if path.name.startswith("."):
+            if time.time() - mtime > STALE_SECONDS:
+                stale.append(path)
+        elif path.name not in keep:
+            entries.append((mtime, path))
+    for path in stale:
+        shutil.rmtree(path, ignore_errors=True)
+
+    entries.sort()
+    removed = sum(_remove_dir(path) for _, path in entries[:max(0, len(entries) + len(keep) - max_entries)])
+    for lock in base.glob("*.lock"):
+        if lock.stem not in keep:
+            _remove_idle_lock(lock)
+    return removed
+
+
+def _thread_lock(key):
+    with _locks_guard:
+        return _locks.setdefault(key, threading.Lock())
+
+
+def _lock(handle, blocking=True):
+    """Take an exclusive lock on ``handle``; without ``blocking``, return ``False`` if it is held."""
+    try:
+        if fcntl is not None:
+            fcntl.flock(handle, fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+    except OSError:
+        if blocking:
+            raise
+        return False
+    return True
+
+
+def _unlock(handle):
+    if fcntl is not None:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+    else:
+        handle.seek(0)
+        msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+@contextmanager
+def _file_lock(key):
+    path = root() / f"{key}.lock"
+    while True:
+        with open(path, "a+b") as handle:
+            _lock(handle)
+            try:
+                # prune menghapus file kunci yang menganggur; kunci pada inode yatim tidak melindungi apa pun
+                if not _is_current(handle, path):
+                    continue
+                yield
+                return
+            finally:
+                _unlock(handle)
+
+
+def get_or_train(key, train):
+    """Return the model for ``key``, calling ``train()`` only if no one has stored it yet.
+
+    Returns ``(model, trained)`` where ``trained`` says whether this call ran
+    the fit.
+    """
+    model = get(key)
+    if model is not None:
+        return model, False
+    with _thread_lock(key), _file_lock(key):
+        # Sesi lain mungkin selesai melatih selama kita menunggu kunci
+        model = get(key)
+        if model is not None:
+            return model, False
+        model = train()
+        put(key, model)
+        return model, True
+
+
+def train_sarima(item):
+    """Worker entry point: ``(series, order, seasonal_order)`` trained once into the store.
+
+    Returns ``(key, trained)``; load the model with :func:`get`.
+    """
+    from forecasting import models
+
+    series, order, seasonal_order = item
+    key = model_key(series, sarima_spec(order, seasonal_order))
+    _, trained = get_or_train(key, lambda: models.fit_sarima(item))
+    return key, trained
+
+
+def sarima_spec(order, seasonal_order):
+    """The specification part of a model key for the pages' SARIMA fits."""
+    return {
+        "order": [int(v) for v in order],
+        "seasonal_order": [int(v) for v in seasonal_order],
+        "enforce_stationarity": False,
+        "enforce_invertibility": False,
+    }
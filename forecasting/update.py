@@ -0,0 +1,124 @@
+"""Incremental model updates when an upload extends a model's training range.
+
+Instead of refitting by maximum likelihood, the observations after the
+model's ``last_date`` are run through the Kalman filter with the stored
+parameters.  The standardized one-step-ahead errors on those observations
+drive a drift check; only when they are clearly inconsistent with the model
+is a refit started (warm-started from the stored parameters).
+
+A refit uses the model's stored training observations followed by the new
+ones, so an upload holding only recent data does not discard the history.
+Refitted models go through :mod:`forecasting.store`, keyed by that
+combined series, so other sessions and processes reuse them instead of
+refitting again.
+The pages run :func:`update_task` on the shared process pool, so a refit does
+not block the session.
+"""
+
+import hashlib
+import json
+
+import numpy as np
+import pandas as pd
+
+from forecasting import artifacts, store
+from forecasting.cache import LRUCache
+
+DRIFT_PVALUE = 0.01
+
+_updates = LRUCache(16)
+
+
+def drift_pvalue(errors):
+    """Smallest p-value of a variance (chi-square) and a bias (normal) test on standardized errors."""
+    from scipy import stats
+
+    errors = np.asarray(errors, dtype=float)
+    errors = errors[np.isfinite(errors)]
+    n = len(errors)
+    if n == 0:
+        return 1.0
+    variance_p = stats.chi2.sf(np.sum(errors ** 2), n)
+    bias_p = 2 * stats.norm.sf(abs(errors.mean()) * np.sqrt(n))
+    return float(min(variance_p, bias_p))
+
+
+def training_series(model, series):
+    """``model``'s training observations followed by those of ``series`` after its range.
+
+    Models saved without their training data fall back to ``series`` only
+    when it covers the whole training range; otherwise ``None``.
+    """
+    last_date = model.last_date
+    new = series[series.index > last_date] if last_date is not None else series.iloc[:0]
+    history = model.history()
+    if history is not None:
+        return pd.concat([history, new])
+    first_date = model.spec.get("first_date")
+    if first_date is not None and len(series) and series.index[0] <= pd.Timestamp(first_date):
+        return series
+    return None
+
+
+def refit(model, series):
+    """Re-estimate ``model``'s specification on its history plus ``series``, starting from its parameters.
+
+    The result is stored in (or taken from) the shared model store.  Raises
+    ``ValueError`` when the training history is unavailable.
+    """
+    from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+    combined = training_series(model, series)
+    if combined is None:
+        raise ValueError("Training history of the model is not available for a refit")
+    init_kwds = dict(model.spec["init_kwds"])
+    init_kwds.pop("trend_offset", None)
+
+    def train():
+        results = SARIMAX(combined, **init_kwds).fit(start_params=model.params.values, disp=False)
+        return artifacts.from_results(results)
+
+    refitted, _ = store.get_or_train(store.model_key(combined, init_kwds), train)
+    return refitted
+
+
+def update_model(model, series, allow_refit=True):
+    """Bring ``model`` up to date with the observations of ``series`` after its training range.
+
+    Returns ``(model, status, n_new)`` where ``status`` is ``"current"``
+    (nothing new), ``"extended"`` (filtered with existing parameters),
+    ``"refit"`` (drift detected and model re-estimated), ``"drift"`` (drift
+    detected, refit disabled or training history unavailable) or
+    ``"unknown"`` (training range not recorded).
+    """
+    last_date = getattr(model, "last_date", None)
+    if last_date is None:
+        return model, "unknown", 0
+    new = series[series.index > last_date]
+    if new.empty:
+        return model, "current", 0
+
+    key = (
+        hashlib.sha256(json.dumps(model.spec, sort_keys=True).encode()).hexdigest(),
+        hashlib.sha256(series.index.asi8.tobytes() + series.to_numpy(dtype=float).tobytes()).hexdigest(),
+        allow_refit,
+    )
+    cached = _updates.get(key)
+    if cached is not None:
+        return cached
+
+    extended, errors = model.extend(new)
+    if drift_pvalue(errors) >= DRIFT_PVALUE:
+        outcome = (extended, "extended", len(new))
+    elif allow_refit and training_series(model, series) is not None:
+        outcome = (refit(model, series), "refit", len(new))
+    else:
+        outcome = (extended, "drift", len(new))
+    _updates.put(key, outcome)
+    return outcome
+
+
+def update_task(item):
+    """Worker entry point: load the model at ``path`` and :func:`update_model` it with ``series``."""
+    path, series = item
+    return update_model(artifacts.load_model(path), series)
@@ -0,0 +1,58 @@
+"""Shared process pool for CPU-bound statsmodels work.
+
+Workers are started with the ``spawn`` method: Streamlit serves sessions from
+threads, and forking a threaded process is unsafe.  Spawned workers pay the
+statsmodels import once, so the pool is created lazily and reused across
+reruns and sessions.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+DEFAULT_WORKERS = int(os.environ.get("PERAMALAN_WORKERS", "0")) or max(1, (os.cpu_count() or 2) - 1)
+
+_lock = threading.Lock()
+_executors = {}
+
+
+def get_executor(max_workers=None):
+    """Return the shared pool with ``max_workers`` processes, recreating it if broken."""
+    n = max_workers or DEFAULT_WORKERS
+    with _lock:
+        executor = _executors.get(n)
+        if executor is None or getattr(executor, "_broken", False):
+            executor = ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("spawn"))
+            _executors[n] = executor
+        return executor
+
+
+def imap_unordered(fn, items, max_workers=None, force_pool=False):
+    """Yield ``(position, fn(item))`` pairs as they finish.
+
+    Runs inline when a single worker is requested or there is only one item,
+    so small jobs do not pay the process start-up cost.  Model fits pass
+    ``force_pool=True``: statsmodels' Kalman filter holds the GIL, so a fit
+    run inline in the Streamlit server would stall every other session.
+    """
+    items = list(items)
+    n = max_workers or DEFAULT_WORKERS
+    if not force_pool and (n <= 1 or len(items) <= 1):
+        for i, item in enumerate(items):
+            yield i, fn(item)
+        return
+
+    executor = get_executor(n)
+    futures = {executor.submit(fn, item): i for i, item in enumerate(items)}
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+def chunked(items, n_chunks):
+    """Split ``items`` into at most ``n_chunks`` contiguous lists."""
+    items = list(items)
+    if not items:
+        return []
+    size = -(-len(items) // max(1, n_chunks))
+    return [items[i:i + size] for i in range(0, len(items), size)]
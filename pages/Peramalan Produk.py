@@ -1,12 +1,9 @@
+import os
 import pandas as pd
 import streamlit as st
 import numpy as np
 import plotly.express as px
-from statsmodels.tsa.stattools import adfuller
-from statsmodels.graphics.tsaplots import plot_acf, plot_pacf
-from statsmodels.tsa.statespace.sarimax import SARIMAX
-import matplotlib.pyplot as plt
-import statsmodels.api as sm
+from forecasting import backtest, charts, correlogram, cube, export, forecasts, ingest, instrument, intermittent, jobs, models, order_search, pipeline, screening, state, workers
 
 # Judul
 st.title("Analisis dan Visualisasi Peramalan Produk")
@@ -15,28 +12,317 @@ st.markdown("""
 **Permintaan Produk** merujuk pada jumlah barang atau unit tertentu yang diminta atau dibutuhkan oleh pelanggan dalam periode waktu tertentu. Fokusnya adalah pada pola permintaan aktual dari data historis yang tersedia, biasanya untuk satu jenis produk atau kelompok produk tertentu.
 """)
 
+
+def tampilkan_peramalan(product, product_data_resampled, forecast_values, forecast_ci, correlogram_values):
+    st.write(f"\n### Peramalan untuk {product}")
+
+    # Plot ACF & PACF Interaktif (dihitung sekaligus untuk semua produk terpilih)
+    st.subheader("Plot ACF & PACF")
+    acf_values, pacf_values = correlogram_values
+
+    acf_fig = px.bar(
+        x=list(range(len(acf_values))),
+        y=acf_values,
+        labels={'x': 'Lag', 'y': 'ACF'},
+        title=f"Autocorrelation (ACF) untuk {product}"
+    )
+    acf_fig.update_layout(
+        hovermode="x unified",
+        dragmode="select",
+        selectdirection="h",
+        showlegend=False
+    )
+
+    pacf_fig = px.bar(
+        x=list(range(len(pacf_values))),
+        y=pacf_values,
+        labels={'x': 'Lag', 'y': 'PACF'},
+        title=f"Partial Autocorrelation (PACF) untuk {product}"
+    )
+    pacf_fig.update_layout(
+        hovermode="x unified",
+        dragmode="select",
+        selectdirection="h",
+        showlegend=False
+    )
+
+    # Menampilkan Plot ACF dan PACF berdampingan
+    col1, col2 = st.columns(2)
+    with col1:
+        st.plotly_chart(acf_fig, use_container_width=True)
+    with col2:
+        st.plotly_chart(pacf_fig, use_container_width=True)
+
+    fig_pred = px.line(title=f"Prediksi SARIMA (12 Bulan ke Depan) untuk {product}",
+                       template='plotly_white')
+    # Histori panjang di-downsample (LTTB) dan digambar dengan WebGL bila masih banyak titik
+    charts.add_line(fig_pred, product_data_resampled.index, product_data_resampled.values, name='Data Aktual')
+    fig_pred.add_scatter(x=forecast_values.index, y=forecast_values.values,
+                         mode='lines+markers', name='Prediksi SARIMA')
+    fig_pred.add_scatter(x=forecast_ci.index, y=forecast_ci.iloc[:, 0],
+                         mode='lines', line=dict(width=0), showlegend=False)
+    fig_pred.add_scatter(x=forecast_ci.index, y=forecast_ci.iloc[:, 1],
+                         mode='lines', fill='tonexty',
+                         fillcolor='rgba(173, 216, 230, 0.4)',
+                         line=dict(width=0), name='Confidence Interval')
+    fig_pred.update_layout(hovermode="x unified")
+    st.plotly_chart(fig_pred, use_container_width=True)
+
+    forecast_df = pd.DataFrame({
+        'Minggu': forecast_values.index,
+        'Prediksi Jumlah': np.round(forecast_values.values).astype(int)
+    })
+
+    fig_bar = px.bar(forecast_df,
+                     x='Minggu',
+                     y='Prediksi Jumlah',
+                     text='Prediksi Jumlah',
+                     title=f"Bar Chart Prediksi Jumlah per Minggu untuk {product}",
+                     template='plotly_white')
+    fig_bar.update_traces(marker_color='dodgerblue', hovertemplate='%{x|%Y-%m-%d}<br>Prediksi: %{y}')
+    fig_bar.update_layout(xaxis_tickformat='%Y-%m-%d', xaxis_tickangle=-45, hovermode="x unified")
+    st.plotly_chart(fig_bar, use_container_width=True)
+
+    forecast_df_display = forecast_df.copy()
+    forecast_df_display['Minggu'] = forecast_df_display['Minggu'].dt.strftime('%Y-%m-%d')
+    forecast_df_display.insert(0, 'No', range(1, len(forecast_df_display) + 1))
+
+    st.write(f"Tabel Hasil Prediksi SARIMA untuk {product}:")
+    st.dataframe(forecast_df_display)
+    return forecast_df
+
+
+def jalankan_peramalan(items, engine, order_mode, n_workers):
+    # Dijalankan di thread pekerjaan latar belakang: tidak boleh memanggil st.*
+    if order_mode == "Otomatis (AIC)":
+        if engine == 'sarima':
+            product_grid = order_search.candidate_grid(p=(0, 1), q=(0, 1), P=(0, 1), Q=(0, 1), s=52)
+            regressors = lambda n: {}
+        else:
+            # Orde ARMA dipilih bersama regresor Fourier dan konstanta, sama seperti model akhirnya
+            product_grid = order_search.candidate_grid(p=(0, 1, 2), q=(0, 1, 2), P=(0,), Q=(0,))
+            regressors = lambda n: {'exog': models.fourier_terms(0, n), 'trend': 'c'}
+        items = [
+            item + (order_search.best_order(item[1], product_grid, max_workers=n_workers, **regressors(len(item[1])))
+                    or (models.PRODUCT_ORDER, models.PRODUCT_SEASONAL_ORDER))
+            for item in items
+        ]
+    # Produk yang sudah pernah diramal dengan data dan parameter yang sama diambil dari cache
+    yield from forecasts.product_forecasts(items, engine, n_workers)
+
+
+def jalankan_backtest(weekly, by_order, n_workers, progress):
+    # Dijalankan di thread pekerjaan latar belakang; fit dan filter tersebar ke pool proses
+    metrics, errors = [], []
+    for (order, seasonal_order), products in by_order.items():
+        results = backtest.run_backtests(
+            {product: weekly.series(product) for product in products},
+            dict(order=order, seasonal_order=seasonal_order,
+                 enforce_stationarity=False, enforce_invertibility=False),
+            max_workers=n_workers, progress=progress,
+        )
+        product_metrics, product_errors = backtest.summary(results)
+        metrics.append(product_metrics)
+        errors.append(product_errors)
+    return pd.concat(metrics, ignore_index=True), pd.concat(errors, ignore_index=True)
+
+
+def tampilkan_akurasi(weekly, items, engine, n_workers):
+    st.subheader("📏 Akurasi Backtest per Produk")
+    if engine != 'sarima':
+        st.caption("Backtest hanya tersedia untuk model SARIMA s=52.")
+        return
+    # Parameter di-fit sekali per produk pada data sebelum titik awal pertama, lalu data difilter ulang
+    by_order = {}
+    for item in items:
+        order, seasonal_order = item[3:5] if len(item) > 3 else (models.PRODUCT_ORDER, models.PRODUCT_SEASONAL_ORDER)
+        by_order.setdefault((tuple(order), tuple(seasonal_order)), []).append(item[0])
+    job = jobs.session_job(
+        "_job_akurasi", jobs.submit_steps,
+        ("akurasi", [(order, seasonal_order, [(product, screening.series_hash(weekly.series(product).to_numpy()))
+                                             for product in products])
+                     for (order, seasonal_order), products in by_order.items()]),
+        lambda progress: jalankan_backtest(weekly, by_order, n_workers, progress),
+        label=f"Backtest {len(items)} produk",
+    )
+    if not jobs.watch(job, "Menghitung akurasi backtest"):
+        return
+    if job.status == jobs.ERROR:
+        st.error(f"Backtest gagal: {job.error}")
+        return
+    metrics, errors = job.result
+    if len(metrics):
+        st.dataframe(metrics.groupby('Nama Barang')[list(backtest.METRICS)].mean().round(3).reset_index())
+        fig_mape = px.line(metrics, x='Horizon', y='MAPE', color='Nama Barang', markers=True,
+                           title="MAPE per Horizon (minggu)", template='plotly_white')
+        fig_mape.update_layout(hovermode="x unified", yaxis_title="MAPE (%)")
+        st.plotly_chart(fig_mape, use_container_width=True)
+    for _, row in errors.iterrows():
+        st.warning(f"Backtest {row['Nama Barang']} gagal: {row['error']}")
+
+
+@st.fragment
+def bagian_peramalan(weekly, top_items, adf_pass_products, adf_fail_products, insufficient_data_products,
+                     batch_results, engine, order_mode, n_workers):
+    # Pilihan produk dan tombol peramalan hanya menjalankan ulang fragmen ini
+    timer = instrument.recorder_for_fragment("Peramalan Produk", "peramalan")
+    timer.lap("widgets")
+    st.subheader("Pilih Metode Peramalan")
+    mode = st.radio("Metode:", ["Top 5 Produk Teratas", "Pilih Produk Sendiri"])
+
+    selected_products = []
+    if mode == "Top 5 Produk Teratas":
+        selected_products = [p for p in top_items['Nama Barang'] if p in adf_pass_products]
+
+        if not selected_products:
+            st.warning("Tidak ada dari Top 5 produk yang lolos uji ADF. Silakan pilih produk sendiri.")
+
+        gagal_adf = [p for p in top_items['Nama Barang'] if p in adf_fail_products]
+        kurang_data = [p for p in top_items['Nama Barang'] if p in insufficient_data_products]
+
+        if gagal_adf or kurang_data:
+            st.subheader("Produk dari Top 5 yang Tidak Lolos Peramalan:")
+            if gagal_adf:
+                st.write("Produk tidak lolos uji ADF:", ', '.join(gagal_adf))
+            if kurang_data:
+                st.write("Produk dengan data tidak cukup:", ', '.join(kurang_data))
+
+    else:
+        if adf_pass_products:
+            selected_product = st.selectbox("Pilih produk untuk dilakukan peramalan:", adf_pass_products)
+            selected_products = [selected_product]
+        else:
+            st.warning("Tidak ada produk yang lolos uji ADF.")
+
+    # Produk yang tidak lolos ADF atau datanya kurang: Croston/SBA/TSB untuk semua produk sekaligus
+    excluded = list(adf_fail_products) + list(insufficient_data_products)
+    timer.lap("intermittent")
+    if excluded:
+        with st.expander(f"Peramalan permintaan intermiten untuk {len(excluded)} produk yang tidak lolos"):
+            method = st.radio("Metode:", list(intermittent.METHODS), index=1, horizontal=True,
+                              format_func=str.upper, key="metode_intermiten")
+            profil = intermittent.profile_frame(weekly, excluded, method)
+            st.dataframe(profil.style.format({'ADI': "{:.2f}", 'CV2': "{:.2f}", 'Prediksi / minggu': "{:,.1f}"}))
+            hasil_intermiten = intermittent.forecast_products(weekly, excluded, models.PRODUCT_STEPS, method)
+
+            product = st.selectbox("Lihat produk:", excluded, key="produk_intermiten")
+            rows = hasil_intermiten[hasil_intermiten['Nama Barang'] == product]
+            row, mulai = weekly.row(product), weekly.first[weekly.row(product)]
+            fig_intermiten = px.line(title=f"Prediksi {method.upper()} untuk {product}", template='plotly_white')
+            charts.add_line(fig_intermiten, weekly.index[mulai:], weekly.values[row, mulai:], name='Data Aktual')
+            fig_intermiten.add_scatter(x=rows['Minggu'], y=rows['Batas Bawah'], mode='lines',
+                                       line=dict(width=0), showlegend=False)
+            fig_intermiten.add_scatter(x=rows['Minggu'], y=rows['Batas Atas'], mode='lines', fill='tonexty',
+                                       fillcolor='rgba(173, 216, 230, 0.4)', line=dict(width=0),
+                                       name='Confidence Interval')
+            fig_intermiten.add_scatter(x=rows['Minggu'], y=rows['Prediksi'], mode='lines',
+                                       name=f'Prediksi {method.upper()}')
+            fig_intermiten.update_layout(hovermode="x unified")
+            st.plotly_chart(fig_intermiten, use_container_width=True)
+            st.caption("Ukuran permintaan dan jarak antar-permintaan dihaluskan terpisah; prediksi berupa rata-rata "
+                       "permintaan per minggu yang datar sepanjang horizon.")
+            export.download_buttons(hasil_intermiten, "forecast_intermiten")
+    timer.lap("submit")
+
+    precomputed = {}
+    if batch_results is not None and 'products' in batch_results:
+        if batch_results['meta'].get('engine') == engine and order_mode.startswith("Default"):
+            # Hanya produk yang diramal model musiman; produk intermiten di batch tidak memakai jalur ini
+            diagnostics = batch_results.get('diagnostics')
+            seasonal = set(adf_pass_products) if diagnostics is None else set(
+                diagnostics.loc[diagnostics['status'] == 'forecast', 'Nama Barang'])
+            precomputed = {name: rows for name, rows in batch_results['products'].groupby('Nama Barang')
+                           if name in seasonal}
+            st.info(f"Menggunakan hasil peramalan batch ({batch_results['meta']['created']}) "
+                    f"untuk {len(precomputed)} produk.")
+
+    hitung_akurasi = st.checkbox("Hitung akurasi (backtest rolling-origin)", value=False)
+
+    if selected_products and st.button("Lakukan Peramalan"):
+        # Fit berjalan sebagai pekerjaan latar belakang; ID-nya disimpan di sesi agar bertahan saat rerun
+        items = [(product, weekly.series(product), models.PRODUCT_STEPS)
+                 for product in selected_products if product not in precomputed]
+        job = jobs.submit(
+            ("produk", engine, order_mode,
+             [(product, screening.series_hash(values.to_numpy())) for product, values, _ in items]),
+            lambda: jalankan_peramalan(items, engine, order_mode, n_workers),
+            total=len(items),
+            label=f"Peramalan {len(items)} produk",
+        )
+        st.session_state["_job_produk"] = (job.id, tuple(selected_products))
+
+    entry = st.session_state.get("_job_produk")
+    job = jobs.get(entry[0]) if entry and entry[1] == tuple(selected_products) else None
+    if job is not None:
+        timer.lap("forecast")
+        # ACF/PACF semua produk terpilih dalam satu perhitungan (maks. 40 lag, setengah panjang deret)
+        correlograms = dict(zip(selected_products, correlogram.correlograms(
+            [weekly.series(product).dropna() for product in selected_products], nlags=40
+        )))
+
+        def tampilkan_hasil(results):
+            # Dipanggil tiap kali pekerjaan dipantau: produk yang sudah selesai langsung ditampilkan
+            forecast_frames = {}
+            fitted = [(product, None, None) for product in selected_products if product in precomputed]
+            for product in [p for p in selected_products if p in precomputed]:
+                rows = precomputed[product].set_index('Minggu')
+                forecast_frames[product] = tampilkan_peramalan(
+                    product, weekly.series(product), rows['Prediksi'], rows[['Batas Bawah', 'Batas Atas']],
+                    correlograms[product]
+                )
+            for result in results:
+                product = result['product']
+                fitted.append((product, None, None, result['order'], result['seasonal_order']))
+                forecast_frames[product] = tampilkan_peramalan(
+                    product, weekly.series(product), result['forecast'], result['conf_int'],
+                    correlograms[product]
+                )
+            return forecast_frames, fitted
+
+        finished = jobs.watch(job, f"Melatih model SARIMA untuk {job.total} produk", render=tampilkan_hasil)
+        if finished and job.status == jobs.ERROR:
+            st.error(f"Peramalan gagal: {job.error}")
+        elif finished:
+            forecast_frames, fitted = tampilkan_hasil(job.results)
+
+            if hitung_akurasi:
+                timer.lap("backtest")
+                tampilkan_akurasi(weekly, fitted, engine, n_workers)
+
+            # Unduh hasil peramalan semua produk dalam satu file
+            st.subheader("Unduh Hasil Peramalan")
+            export.download_buttons(
+                export.combine({product: forecast_frames[product] for product in selected_products}),
+                "forecast_produk"
+            )
+
+    instrument.finish_fragment(timer)
+
+
+timer = instrument.recorder_for_page("Peramalan Produk")
+
 # File uploader
-uploaded_file = st.file_uploader("Upload Excel file", type=["xlsx"])
+uploaded_file = st.file_uploader("Upload Excel/CSV/Parquet file", type=ingest.UPLOAD_TYPES)
 
 if uploaded_file:
-    df = pd.read_excel(uploaded_file)
+    timer.lap("read_upload")
+    df = state.track("upload", ingest.load_frame(uploaded_file))
     st.write("Uploaded Data:")
     st.dataframe(df.style.hide(axis="index"))
 
     required_columns = {'Jumlah', 'Nama Barang', 'Tanggal'}
     if required_columns.issubset(df.columns):
-        df['Jumlah'] = df['Jumlah'].astype(str).str.replace(r'[^\d]', '', regex=True)
-        df['Jumlah'] = pd.to_numeric(df['Jumlah'], errors='coerce').fillna(0).astype(int)
-        df['Nama Barang'] = df['Nama Barang'].astype(str).str.strip().str.lower()
-        df['Nama Barang'] = df['Nama Barang'].str.replace(r'\s+', ' ', regex=True)
-        df = df[~df['Nama Barang'].str.contains('pekerjaan', case=False)]
-        df['Tanggal'] = pd.to_datetime(df['Tanggal'], errors='coerce')
-        df = df.dropna(subset=['Tanggal'])
+        timer.lap("clean")
+        df_cleaned = state.track("produk", ingest.load_frame(uploaded_file, "produk"))
+        digest = ingest.file_digest(uploaded_file)
 
-        df_cleaned = df[df['Jumlah'] > 0]
+        # Agregat harian/mingguan/bulanan/kuartalan dan peringkat produk, dibangun sekali per file
+        timer.lap("aggregate_cube")
+        data_cube = state.track("cube", cube.aggregate_cube(df_cleaned, key=(digest, "produk")))
 
-        df_agg = df_cleaned.groupby('Nama Barang', as_index=False).agg({'Jumlah': 'sum'})
-        top_items = df_agg.nlargest(5, 'Jumlah').reset_index(drop=True)
+        timer.lap("top5_charts")
+        top_items = data_cube.top(5)
+        top_products_grouped = data_cube.long("M", top_items['Nama Barang']).rename(columns={'Tanggal': 'Bulan'})
 
         st.write("5 Barang dengan Jumlah Unit Terbanyak:")
         top_display = top_items[['Nama Barang', 'Jumlah']].copy()
@@ -59,11 +345,6 @@ if uploaded_file:
         )
         st.plotly_chart(fig_top, use_container_width=True)
 
-        top_products = df_cleaned[df_cleaned['Nama Barang'].isin(top_items['Nama Barang'])]
-        top_products['Bulan'] = top_products['Tanggal'].dt.to_period('M')
-        top_products_grouped = top_products.groupby(['Bulan', 'Nama Barang'])['Jumlah'].sum().reset_index()
-        top_products_grouped['Bulan'] = pd.to_datetime(top_products_grouped['Bulan'].astype(str))
-
         st.markdown("### Tren Permintaan 5 Produk Teratas (Agregasi Bulanan)")
         fig_trend = px.line(top_products_grouped,
                             x='Bulan',
@@ -82,150 +363,43 @@ if uploaded_file:
         )
         st.plotly_chart(fig_trend, use_container_width=True)
 
-        adf_pass_products = []
-        adf_fail_products = []
-        insufficient_data_products = []
-        resampled_products = {}
-
-        for product in df_cleaned['Nama Barang'].unique():
-            product_data = df_cleaned[df_cleaned['Nama Barang'] == product].set_index('Tanggal')['Jumlah']
-            product_data_resampled = product_data.resample('W').sum()
-
-            if len(product_data_resampled.dropna()) > 10:
-                result = adfuller(product_data_resampled.dropna())
-                if result[1] <= 0.05:
-                    adf_pass_products.append(product)
-                    resampled_products[product] = product_data_resampled
-                else:
-                    adf_fail_products.append(product)
-            else:
-                insufficient_data_products.append(product)
-
-        st.subheader("Pilih Metode Peramalan")
-        mode = st.radio("Metode:", ["Top 5 Produk Teratas", "Pilih Produk Sendiri"])
-
-        selected_products = []
-        if mode == "Top 5 Produk Teratas":
-            selected_products = [p for p in top_items['Nama Barang'] if p in adf_pass_products]
-
-            if not selected_products:
-                st.warning("Tidak ada dari Top 5 produk yang lolos uji ADF. Silakan pilih produk sendiri.")
-
-            gagal_adf = [p for p in top_items['Nama Barang'] if p in adf_fail_products]
-            kurang_data = [p for p in top_items['Nama Barang'] if p in insufficient_data_products]
-
-            if gagal_adf or kurang_data:
-                st.subheader("Produk dari Top 5 yang Tidak Lolos Peramalan:")
-                if gagal_adf:
-                    st.write("Produk tidak lolos uji ADF:", ', '.join(gagal_adf))
-                if kurang_data:
-                    st.write("Produk dengan data tidak cukup:", ', '.join(kurang_data))
+        # Deret mingguan per produk diambil dari cube (matriks produk x minggu)
+        weekly = data_cube.matrix("W")
 
-        else:
-            if adf_pass_products:
-                selected_product = st.selectbox("Pilih produk untuk dilakukan peramalan:", adf_pass_products)
-                selected_products = [selected_product]
-            else:
-                st.warning("Tidak ada produk yang lolos uji ADF.")
-
-        if selected_products and st.button("Lakukan Peramalan"):
-            for product in selected_products:
-                st.write(f"\n### Peramalan untuk {product}")
-                product_data_resampled = resampled_products[product]
-
-                max_lags = min(40, len(product_data_resampled.dropna()) // 2)
-
-                # Plot ACF & PACF Interaktif
-                st.subheader("Plot ACF & PACF")
-
-                acf_values = sm.tsa.stattools.acf(product_data_resampled.dropna(), nlags=max_lags)
-                pacf_values = sm.tsa.stattools.pacf(product_data_resampled.dropna(), nlags=max_lags)
-
-                acf_fig = px.bar(
-                    x=list(range(len(acf_values))),
-                    y=acf_values,
-                    labels={'x': 'Lag', 'y': 'ACF'},
-                    title=f"Autocorrelation (ACF) untuk {product}"
-                )
-                acf_fig.update_layout(
-                    hovermode="x unified",
-                    dragmode="select",
-                    selectdirection="h",
-                    showlegend=False
-                )
+        # Uji ADF paralel, hasil di-cache per produk
+        timer.lap("adf_screening")
+        adf_progress = st.progress(0.0, text="Uji stasioneritas (ADF)...")
 
-                pacf_fig = px.bar(
-                    x=list(range(len(pacf_values))),
-                    y=pacf_values,
-                    labels={'x': 'Lag', 'y': 'PACF'},
-                    title=f"Partial Autocorrelation (PACF) untuk {product}"
-                )
-                pacf_fig.update_layout(
-                    hovermode="x unified",
-                    dragmode="select",
-                    selectdirection="h",
-                    showlegend=False
-                )
+        def update_adf_progress(done, total):
+            fraction = done / total if total else 1.0
+            adf_progress.progress(fraction, text=f"Uji stasioneritas (ADF): {done}/{total} produk")
+
+        adf_pass_products, adf_fail_products, insufficient_data_products = screening.screen_products(
+            weekly, progress=update_adf_progress
+        )
+        adf_progress.empty()
+
+        # Pengaturan di sidebar berada di luar fragmen: mengubahnya menjalankan ulang seluruh halaman
+        st.sidebar.subheader("Pengaturan Peramalan")
+        n_workers = st.sidebar.number_input(
+            "Jumlah worker paralel:", min_value=1,
+            max_value=max(workers.DEFAULT_WORKERS, os.cpu_count() or 1),
+            value=workers.DEFAULT_WORKERS
+        )
+        seasonal_mode = st.sidebar.radio(
+            "Model musiman mingguan:",
+            ["SARIMA s=52", "Fourier + ARMA (lebih cepat)"]
+        )
+        engine = 'sarima' if seasonal_mode == "SARIMA s=52" else 'fourier'
+        order_mode = st.sidebar.radio(
+            "Parameter SARIMA:",
+            ["Default (1,0,1)", "Otomatis (AIC)"]
+        )
+
+        # Hasil peramalan batch (python -m forecasting batch ...) untuk file yang sama
+        batch_results = pipeline.load_results(digest)
+
+        bagian_peramalan(weekly, top_items, adf_pass_products, adf_fail_products, insufficient_data_products,
+                         batch_results, engine, order_mode, n_workers)
 
-                # Menampilkan Plot ACF dan PACF berdampingan
-                col1, col2 = st.columns(2)
-                with col1:
-                    st.plotly_chart(acf_fig, use_container_width=True)
-                with col2:
-                    st.plotly_chart(pacf_fig, use_container_width=True)
-
-                model = SARIMAX(product_data_resampled,
-                                order=(1, 0, 1),
-                                seasonal_order=(1, 0, 1, 52),
-                                enforce_stationarity=False,
-                                enforce_invertibility=False)
-                results = model.fit()
-
-                forecast_object = results.get_forecast(steps=52)
-                forecast_values = forecast_object.predicted_mean
-                forecast_ci = forecast_object.conf_int()
-
-                if not isinstance(forecast_values.index, pd.DatetimeIndex):
-                    last_date = product_data_resampled.index[-1]
-                    forecast_values.index = pd.date_range(start=last_date + pd.Timedelta(weeks=1), periods=52, freq='W')
-                    forecast_ci.index = forecast_values.index
-
-                forecast_values = forecast_values.clip(lower=0)
-                forecast_ci = forecast_ci.clip(lower=0)
-
-                fig_pred = px.line(title=f"Prediksi SARIMA (12 Bulan ke Depan) untuk {product}",
-                                   template='plotly_white')
-                fig_pred.add_scatter(x=product_data_resampled.index, y=product_data_resampled.values,
-                                     mode='lines+markers', name='Data Aktual')
-                fig_pred.add_scatter(x=forecast_values.index, y=forecast_values.values,
-                                     mode='lines+markers', name='Prediksi SARIMA')
-                fig_pred.add_scatter(x=forecast_ci.index, y=forecast_ci.iloc[:, 0],
-                                     mode='lines', line=dict(width=0), showlegend=False)
-                fig_pred.add_scatter(x=forecast_ci.index, y=forecast_ci.iloc[:, 1],
-                                     mode='lines', fill='tonexty',
-                                     fillcolor='rgba(173, 216, 230, 0.4)',
-                                     line=dict(width=0), name='Confidence Interval')
-                fig_pred.update_layout(hovermode="x unified")
-                st.plotly_chart(fig_pred, use_container_width=True)
-
-                forecast_df = pd.DataFrame({
-                    'Minggu': forecast_values.index,
-                    'Prediksi Jumlah': np.round(forecast_values.values).astype(int)
-                })
-
-                fig_bar = px.bar(forecast_df,
-                                 x='Minggu',
-                                 y='Prediksi Jumlah',
-                                 text='Prediksi Jumlah',
-                                 title=f"Bar Chart Prediksi Jumlah per Minggu untuk {product}",
-                                 template='plotly_white')
-                fig_bar.update_traces(marker_color='dodgerblue', hovertemplate='%{x|%Y-%m-%d}<br>Prediksi: %{y}')
-                fig_bar.update_layout(xaxis_tickformat='%Y-%m-%d', xaxis_tickangle=-45, hovermode="x unified")
-                st.plotly_chart(fig_bar, use_container_width=True)
-
-                forecast_df_display = forecast_df.copy()
-                forecast_df_display['Minggu'] = forecast_df_display['Minggu'].dt.strftime('%Y-%m-%d')
-                forecast_df_display.insert(0, 'No', range(1, len(forecast_df_display) + 1))
-
-                st.write(f"Tabel Hasil Prediksi SARIMA untuk {product}:")
-                st.dataframe(forecast_df_display)
+instrument.render_sidebar(timer)
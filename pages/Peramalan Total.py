@@ -1,13 +1,7 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-import pickle
-import os
 import plotly.express as px
-import plotly.graph_objects as go
-import statsmodels.api as sm
-import gzip
-from statsmodels.tsa.stattools import adfuller
+from forecasting import artifacts, backtest, charts, correlogram, cube, export, forecasts, ingest, instrument, jobs, order_search, pipeline, scenarios, state, store, update
 
 st.title("Analisis dan Visualisasi Peramalan Total")
 
@@ -15,130 +9,13 @@ st.markdown("""
 **Permintaan Total (SARIMA)** adalah hasil dari proses peramalan berdasarkan model SARIMA, yang memproyeksikan jumlah permintaan ke masa depan dengan mempertimbangkan tren, musim (seasonality), dan fluktuasi historis dalam data. Permintaan total ini mencerminkan estimasi dari **seluruh permintaan** yang mungkin terjadi berdasarkan pola masa lalu, bukan hanya angka aktual dari data yang sudah terjadi.
 """)
 
-# File uploader
-uploaded_file = st.file_uploader("Upload Excel file", type=["xlsx"])
-
-if uploaded_file:
+@st.fragment
+def bagian_model_dan_peramalan(input_data, MODEL_FILE, selected_year, digest):
+    # Widget di bagian ini hanya menjalankan ulang fragmen ini, bukan seluruh halaman
+    timer = instrument.recorder_for_fragment("Peramalan Total", "peramalan")
     try:
-        # Read Excel file
-        input_data = pd.read_excel(uploaded_file)
-        st.write("Uploaded Data:")
-        st.dataframe(input_data)
-
-        # Check columns
-        required_columns = ["Tanggal", "Jumlah"]
-        if not all(col in input_data.columns for col in required_columns):
-            st.error(f"Uploaded file must contain columns: {required_columns}")
-            st.stop()
-
-        # Clean and prepare
-        input_data["Jumlah"] = input_data["Jumlah"].astype(str).str.replace(r'\D', '', regex=True).astype(float)
-        # Tambahkan transformasi log untuk stabilisasi variansi
-        input_data["Jumlah_Log"] = np.log1p(input_data["Jumlah"])
-        input_data.dropna(inplace=True)
-        input_data["Tanggal"] = pd.to_datetime(input_data["Tanggal"])
-        input_data = input_data.sort_values("Tanggal")
-
-        # Drop duplicate Tanggal
-        input_data = input_data.drop_duplicates(subset="Tanggal")
-        input_data.set_index("Tanggal", inplace=True)
-
-        # Dominant year detection
-        dominant_year = int(pd.Series(input_data.index.year).mode()[0])
-        st.info(f"Data terbanyak berasal dari tahun: {dominant_year}")
-
-        # Map model files
-        model_map = {
-            2022: "modelsarima2022.pkl.gz",
-            2023: "modelsarima2023.pkl.gz",
-            2024: "modelsarima2024.pkl.gz"
-        }
-
-        year_options = list(model_map.keys())
-        if dominant_year not in year_options:
-            year_options.append(dominant_year)
-
-        selected_year = st.selectbox(
-            "Pilih tahun model SARIMA (override jika perlu):",
-            options=sorted(year_options),
-            index=year_options.index(dominant_year)
-        )
-
-        MODEL_FILE = model_map.get(selected_year, f"modelsarima{selected_year}.pkl")
-
-        # Visualisasi bulanan
-        st.subheader("📅 Jumlah Barang per Bulan")
-        monthly_data = input_data["Jumlah"].resample("M").sum()
-        monthly_df = monthly_data.reset_index().rename(columns={"Jumlah": "Total Jumlah"})
-
-        fig_monthly = px.line(
-            monthly_df,
-            x="Tanggal",
-            y="Total Jumlah",
-            title="Total Jumlah Barang per Bulan",
-            markers=True,
-            hover_data={"Tanggal": "|%B %Y", "Total Jumlah": ":,.0f"}
-        )
-        fig_monthly.update_layout(
-            xaxis_title="Bulan",
-            yaxis_title="Jumlah",
-            hovermode="x unified",
-            dragmode="select",
-            selectdirection="h"
-        )
-        st.plotly_chart(fig_monthly, use_container_width=True)
-
-        # ADF Test
-        st.subheader("Uji Stasioneritas (ADF Test)")
-        adf_result = adfuller(input_data["Jumlah"])
-        st.write(f"ADF Statistic: {adf_result[0]}")
-        st.write(f"p-value: {adf_result[1]}")
-        st.write("Critical Values:")
-        for key, value in adf_result[4].items():
-            st.write(f"   {key}: {value}")
-        if adf_result[1] > 0.05:
-            st.warning("Data tidak stasioner, pertimbangkan differencing!")
-        else:
-            st.success("Data sudah stasioner!")
-
-        # Plot ACF & PACF Interaktif
-        st.subheader("Plot ACF & PACF")
-        acf_values = sm.tsa.stattools.acf(input_data["Jumlah"], nlags=40)
-        pacf_values = sm.tsa.stattools.pacf(input_data["Jumlah"], nlags=40)
-
-        acf_fig = px.bar(
-            x=list(range(len(acf_values))),
-            y=acf_values,
-            labels={'x': 'Lag', 'y': 'ACF'},
-            title="Autocorrelation (ACF)"
-        )
-        acf_fig.update_layout(
-            hovermode="x unified",
-            dragmode="select",
-            selectdirection="h",
-            showlegend=False
-        )
-
-        pacf_fig = px.bar(
-            x=list(range(len(pacf_values))),
-            y=pacf_values,
-            labels={'x': 'Lag', 'y': 'PACF'},
-            title="Partial Autocorrelation (PACF)"
-        )
-        pacf_fig.update_layout(
-            hovermode="x unified",
-            dragmode="select",
-            selectdirection="h",
-            showlegend=False
-        )
-
-        col1, col2 = st.columns(2)
-        with col1:
-            st.plotly_chart(acf_fig, use_container_width=True)
-        with col2:
-            st.plotly_chart(pacf_fig, use_container_width=True)
-
         # Input parameter SARIMA
+        timer.lap("parameters")
         st.subheader("Parameter SARIMA")
         p = st.number_input("Masukkan nilai p (AR)", min_value=0, value=1)
         d = st.number_input("Masukkan nilai d (Diff)", min_value=0, value=1)
@@ -148,60 +25,110 @@ if uploaded_file:
         Q = st.number_input("Masukkan nilai Q (Seasonal MA)", min_value=0, value=1)
         s = st.number_input("Masukkan nilai s (Seasonality)", min_value=1, value=12)
 
-        # Load or train model
-        if os.path.exists(MODEL_FILE):
-            with gzip.open(MODEL_FILE, "rb") as f:
-                model_fit = pickle.load(f)
-            st.success(f"Model {MODEL_FILE} berhasil dimuat.")
-        else:
-            st.warning(f"Model file untuk tahun {selected_year} ({MODEL_FILE}) tidak ditemukan.")
-            st.info("Model akan dibuat dari data yang tersedia dengan parameter SARIMA yang Anda masukkan.")
-            try:
-                sarima_model = sm.tsa.statespace.SARIMAX(
-                    input_data["Jumlah_Log"],
-                    order=(p, d, q),
-                    seasonal_order=(P, D, Q, s),
-                    enforce_stationarity=False,
-                    enforce_invertibility=False                         
+        param_source = st.radio(
+            "Sumber parameter SARIMA untuk pelatihan model:",
+            ["Manual", "Otomatis (AIC)"],
+            horizontal=True
+        )
+        if param_source == "Otomatis (AIC)":
+            if artifacts.model_exists(MODEL_FILE):
+                st.caption("Parameter hanya dipakai jika model untuk tahun terpilih perlu dilatih.")
+            else:
+                # Pencarian berjalan di latar belakang; sesi lain dengan data sama memakai pekerjaan yang sama
+                series = input_data["Jumlah_Log"]
+                job = jobs.session_job(
+                    "_job_orde", jobs.submit_steps, ("orde", digest, int(s)),
+                    lambda progress: order_search.search_orders(
+                        series, order_search.differencing_grid(series, int(s)), progress=progress
+                    ),
+                    label="Pencarian parameter SARIMA",
                 )
-                model_fit = sarima_model.fit(disp=False)
-                st.success("Model SARIMA berhasil dibuat.")
-                with open(MODEL_FILE, "wb") as f:
-                    pickle.dump(model_fit, f)
-                st.success(f"Model baru berhasil disimpan sebagai {MODEL_FILE}.")
-            except Exception as train_err:
-                st.error(f"Gagal membuat model SARIMA: {train_err}")
-                st.stop()
+                if not jobs.watch(job, "Mencari parameter SARIMA terbaik"):
+                    return
+                ranking = job.result
+                if ranking:
+                    (p, d, q), (P, D, Q, s) = ranking[0]["order"], ranking[0]["seasonal_order"]
+                    st.success(f"Parameter terbaik: order=({p}, {d}, {q}), seasonal_order=({P}, {D}, {Q}, {s})")
+                    st.dataframe(pd.DataFrame(ranking).head(5))
+                else:
+                    st.warning("Pencarian otomatis gagal, parameter manual digunakan.")
 
         # Forecast
+        timer.lap("forecast_widgets")
         st.subheader("Peramalan")
-        forecast_years = st.slider("Pilih jumlah tahun untuk peramalan:", 1, 5, 1)
+        forecast_years = st.slider("Pilih jumlah tahun untuk peramalan:", 1, forecasts.MAX_TOTAL_STEPS // 12, 1)
         input_periods = forecast_years * 12
 
         if st.button("Predict"):
-            forecast_result = model_fit.get_forecast(steps=input_periods)
-            forecast_mean_log = forecast_result.predicted_mean
-            forecast_mean = np.expm1(forecast_mean_log)  # Kembali ke skala jumlah barang
-            last_date = input_data.index[-1]
-            forecast_index = pd.date_range(start=last_date, periods=input_periods + 1, freq='M')[1:]
-
-            forecast_df = pd.DataFrame({
-                'Tanggal': forecast_index,
-                'Prediksi_Log': forecast_mean_log.values,
-                'Prediksi Jumlah': np.round(forecast_mean.values).astype(int)
-            })
+            st.session_state["_predict_total"] = (digest, MODEL_FILE)
+            # Permintaan yang gagal sebelumnya dicoba lagi
+            for name in ("_job_total", "_job_update"):
+                st.session_state.pop(name, None)
+
+        # Setelah Predict, menggeser slider hanya memotong peramalan 5 tahun yang sudah di-cache
+        if st.session_state.get("_predict_total") == (digest, MODEL_FILE):
+            # Load or train model (baru saat Predict diklik)
+            timer.lap("model_load")
+            if artifacts.model_exists(MODEL_FILE):
+                model_fit = artifacts.load_model(MODEL_FILE)
+                st.success(f"Model {MODEL_FILE} berhasil dimuat.")
+
+                # Perbarui model dengan observasi setelah rentang data latihnya (pelatihan ulang di worker)
+                job = jobs.session_job(
+                    "_job_update", jobs.submit_pool, ("update", MODEL_FILE, digest),
+                    update.update_task, (MODEL_FILE, input_data["Jumlah_Log"]),
+                    label=f"Pembaruan {MODEL_FILE}",
+                )
+                if not jobs.watch(job, "Memperbarui model dengan observasi baru"):
+                    return
+                if job.status == jobs.ERROR:
+                    st.warning(f"Pembaruan model gagal, model tersimpan dipakai apa adanya: {job.error}")
+                    update_status, n_new = "current", 0
+                else:
+                    model_fit, update_status, n_new = job.result
+                if update_status == "extended":
+                    st.info(f"Model diperbarui dengan {n_new} observasi baru tanpa pelatihan ulang.")
+                elif update_status == "refit":
+                    st.warning(f"Pola {n_new} observasi baru berbeda dari model; model dilatih ulang.")
+            else:
+                # Model disimpan per (data, parameter): sesi lain dengan data dan parameter sama memakainya lagi
+                model_key = store.model_key(input_data["Jumlah_Log"], store.sarima_spec((p, d, q), (P, D, Q, s)))
+                model_fit = store.get(model_key)
+                if model_fit is None:
+                    st.warning(f"Model file untuk tahun {selected_year} ({MODEL_FILE}) tidak ditemukan.")
+                    st.info("Model akan dibuat dari data yang tersedia dengan parameter SARIMA yang Anda masukkan.")
+                    # Pelatihan berjalan di latar belakang; rerun tidak membatalkannya dan permintaan sama tidak diulang
+                    job = jobs.session_job(
+                        "_job_total", jobs.submit_pool, ("total", model_key),
+                        store.train_sarima, (input_data["Jumlah_Log"], (p, d, q), (P, D, Q, s)),
+                        label=f"SARIMA {MODEL_FILE}",
+                    )
+                    if not jobs.watch(job, "Melatih model SARIMA"):
+                        return
+                    if job.status == jobs.ERROR:
+                        st.error(f"Gagal membuat model SARIMA: {job.error}")
+                        return
+                    model_fit = store.get(job.result[0])
+                    st.success("Model SARIMA berhasil dibuat.")
+                st.success(f"Model untuk tahun {selected_year} tersimpan di penyimpanan model bersama "
+                           f"({model_key[:12]}).")
+
+            timer.lap("forecast")
+            # Prediksi_Log dan kembali ke skala jumlah barang (expm1), dipotong sesuai horizon
+            horizon = forecasts.total_forecast(model_fit, input_data["Jumlah_Log"])
+            forecast_df = horizon.frame(input_periods)
 
             st.dataframe(forecast_df)
 
+            timer.lap("figures")
             st.subheader("📈 Hasil Peramalan")
-            fig_forecast = px.line(
-                forecast_df,
-                x="Tanggal",
-                y="Prediksi Jumlah",
-                title="Hasil Prediksi Jumlah Barang",
-                markers=True,
-                hover_data={"Tanggal": "|%B %Y", "Prediksi Jumlah": ":,.0f"}
+            # Satu figur untuk garis/batang/area dari data yang sama (data dikirim sekali)
+            fig_forecast = charts.switchable_figure(
+                forecast_df["Tanggal"],
+                forecast_df["Prediksi Jumlah"],
+                title="Hasil Prediksi Jumlah Barang"
             )
+            fig_forecast.update_traces(hovertemplate="%{x|%B %Y}<br>%{y:,.0f}")
             fig_forecast.update_layout(
                 xaxis_title="Tanggal",
                 yaxis_title="Jumlah Prediksi",
@@ -211,28 +138,19 @@ if uploaded_file:
             )
             st.plotly_chart(fig_forecast, use_container_width=True)
 
-            # Download forecast
-            output_filename = "forecast_results.xlsx"
-            forecast_df.to_excel(output_filename, index=False)
-            with open(output_filename, "rb") as output_file:
-                st.download_button("Download Forecast Results", output_file, file_name=output_filename)
+            # Download forecast (dibuat di memori saat tombol diklik)
+            export.download_buttons(forecast_df.copy(), "forecast_results")
 
             # Dashboard Prediksi dalam Skala Log
             st.subheader("📊 Dashboard Visualisasi Hasil Prediksi (Log)")
 
-            # Gabungkan data aktual dan prediksi (log)
-            combined_log_df = pd.concat([
-                input_data["Jumlah_Log"].rename("Log Aktual"),
-                forecast_df.set_index("Tanggal")["Prediksi_Log"].rename("Log Prediksi")
-            ], axis=1).reset_index()
-
-            # Plot log aktual vs log prediksi
-            fig_combined_log = px.line(
-                combined_log_df,
-                x="Tanggal",
-                y=["Log Aktual", "Log Prediksi"],
-                title="Aktual vs Prediksi (Log) Jumlah Barang",
-                markers=True
+            # Plot log aktual vs log prediksi; histori panjang di-downsample untuk tampilan
+            fig_combined_log = charts.series_figure(
+                {
+                    "Log Aktual": input_data["Jumlah_Log"],
+                    "Log Prediksi": forecast_df.set_index("Tanggal")["Prediksi_Log"],
+                },
+                title="Aktual vs Prediksi (Log) Jumlah Barang"
             )
             fig_combined_log.update_layout(
                 xaxis_title="Tanggal",
@@ -272,57 +190,12 @@ if uploaded_file:
                 delta_color="normal" if growth_rate == 0 else ("inverse" if growth_rate < 0 else "off")
             )
 
-            # Bar Chart
-            st.subheader("📊 Bar Chart")
-            fig_bar = px.bar(forecast_df, x="Tanggal", y="Prediksi Jumlah", title="Bar Chart Prediksi")
-            fig_bar.update_layout(
-                hovermode="x unified",
-                dragmode="select",
-                selectdirection="h"
-            )
-            st.plotly_chart(fig_bar, use_container_width=True)
-
-            # Area Chart
-            st.subheader("🌊 Area Chart")
-            fig_area = px.area(forecast_df, x="Tanggal", y="Prediksi Jumlah", title="Area Chart Prediksi")
-            fig_area.update_layout(
-                hovermode="x unified",
-                dragmode="select",
-                selectdirection="h"
-            )
-            st.plotly_chart(fig_area, use_container_width=True)
-
             # 📋 TABEL HASIL PREDIKSI (dengan kolom No)
             st.subheader("📋 Tabel Hasil Prediksi")
             tabel_prediksi = forecast_df.copy().reset_index(drop=True)
             tabel_prediksi.insert(0, "No", range(1, len(tabel_prediksi) + 1))
             st.dataframe(tabel_prediksi.style.format({"Prediksi Jumlah": "{:,.0f}"}))
             
-            # Distribusi Prediksi Bulanan
-            st.subheader("Status Prediksi Bulanan")
-            lead_status_fig = px.bar(
-                forecast_df,
-                x=forecast_df["Tanggal"].dt.strftime("%b %Y"),
-                y="Prediksi Jumlah",
-                title="Distribusi Prediksi per Bulan"
-            )
-            lead_status_fig.update_layout(
-                hovermode="x unified",
-                dragmode="select",
-                selectdirection="h"
-            )
-            st.plotly_chart(lead_status_fig, use_container_width=True)
-
-            # Trend Prediksi Barang
-            st.subheader("Trend Prediksi Barang per Bulan")
-            fig_campaign = px.line(forecast_df, x="Tanggal", y="Prediksi Jumlah", title="Trend Prediksi per Bulan")
-            fig_campaign.update_layout(
-                hovermode="x unified",
-                dragmode="select",
-                selectdirection="h"
-            )
-            st.plotly_chart(fig_campaign, use_container_width=True)
-
             # Pendapatan Tahunan (Akumulasi)
             forecast_df["Tahun"] = forecast_df["Tanggal"].dt.year
             yearly_income = forecast_df.groupby("Tahun")["Prediksi Jumlah"].sum().reset_index()
@@ -364,5 +237,207 @@ if uploaded_file:
                 fig_proporsi.update_layout(hovermode="closest")
                 st.plotly_chart(fig_proporsi, use_container_width=True)
 
+            # Skenario permintaan untuk perencanaan stok
+            timer.lap("scenarios")
+            st.subheader("🎲 Skenario Permintaan (Monte Carlo)")
+            skenario = scenarios.DemandScenarios.from_model(model_fit, forecast_df["Tanggal"], seed=0)
+            kuantil = skenario.quantiles()
+
+            fig_skenario = px.line(title=f"Rentang Permintaan dari {scenarios.N_PATHS:,} Simulasi", template="plotly_white")
+            fig_skenario.add_scatter(x=kuantil.index, y=kuantil["P5"], mode="lines", line=dict(width=0), showlegend=False)
+            fig_skenario.add_scatter(x=kuantil.index, y=kuantil["P95"], mode="lines", fill="tonexty",
+                                     fillcolor="rgba(173, 216, 230, 0.4)", line=dict(width=0), name="P5 - P95")
+            fig_skenario.add_scatter(x=kuantil.index, y=kuantil["P50"], mode="lines+markers", name="Median")
+            fig_skenario.update_layout(xaxis_title="Tanggal", yaxis_title="Jumlah", hovermode="x unified")
+            st.plotly_chart(fig_skenario, use_container_width=True)
+
+            service_level = st.slider("Tingkat layanan (peluang stok mencukupi):", 0.80, 0.99, 0.95, 0.01)
+            stok = st.number_input(
+                "Stok tersedia untuk seluruh horizon:", min_value=0,
+                value=int(round(skenario.totals.mean()))
+            )
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Peluang Kehabisan Stok", f"{skenario.stockout_probability(stok):.1%}")
+            col2.metric("Safety Stock", f"{skenario.safety_stock(service_level):,.0f}")
+            col3.metric("Stok untuk Tingkat Layanan", f"{skenario.reorder_level(service_level):,.0f}")
+            st.caption("Kuantil dihitung dari jalur simulasi yang dikembalikan ke skala jumlah barang (expm1), "
+                       "sehingga median simulasi bisa berbeda dari nilai prediksi titik.")
+
     except Exception as e:
         st.error(f"Terjadi kesalahan saat memproses file: {e}")
+    finally:
+        instrument.finish_fragment(timer)
+
+
+@st.fragment
+def bagian_backtest(input_data, model_map):
+    # Akurasi model tersimpan pada data unggahan: ramalan dari banyak titik awal (rolling origin)
+    timer = instrument.recorder_for_fragment("Peramalan Total", "backtest")
+    st.subheader("📏 Akurasi Model Tersimpan (Backtest)")
+    horizon = st.slider("Horizon backtest (langkah ke depan):", 1, 24, backtest.HORIZON)
+    if st.button("Jalankan Backtest"):
+        timer.lap("backtest")
+        ringkasan, per_horizon = [], []
+        for year, path in model_map.items():
+            if not artifacts.model_exists(path):
+                continue
+            try:
+                metrics = backtest.backtest_model(artifacts.load_model(path), input_data["Jumlah_Log"], horizon)
+            except Exception as err:
+                st.warning(f"Backtest model {year} gagal: {err}")
+                continue
+            per_horizon.append(metrics.assign(Model=str(year)))
+            ringkasan.append({"Model": str(year), **metrics[list(backtest.METRICS)].mean().round(3).to_dict(),
+                              "Origin": int(metrics["n"].iloc[0])})
+
+        if ringkasan:
+            st.dataframe(pd.DataFrame(ringkasan))
+            fig_backtest = px.line(pd.concat(per_horizon), x="Horizon", y="MAPE", color="Model", markers=True,
+                                   title="MAPE per Horizon", template="plotly_white")
+            fig_backtest.update_layout(hovermode="x unified", yaxis_title="MAPE (%)")
+            st.plotly_chart(fig_backtest, use_container_width=True)
+            st.caption("Parameter model tidak diestimasi ulang: data hanya difilter sekali lalu diramal dari setiap "
+                       "titik awal. MASE < 1 berarti lebih akurat daripada ramalan naif musiman.")
+        else:
+            st.info("Tidak ada model tersimpan yang dapat diuji.")
+    instrument.finish_fragment(timer)
+
+
+timer = instrument.recorder_for_page("Peramalan Total")
+
+# File uploader
+uploaded_file = st.file_uploader("Upload Excel/CSV/Parquet file", type=ingest.UPLOAD_TYPES)
+
+if uploaded_file:
+    try:
+        # Read Excel file (di-cache berdasarkan isi file)
+        timer.lap("read_upload")
+        input_data = state.track("upload", ingest.load_frame(uploaded_file))
+        st.write("Uploaded Data:")
+        st.dataframe(input_data)
+
+        # Check columns
+        required_columns = ["Tanggal", "Jumlah"]
+        if not all(col in input_data.columns for col in required_columns):
+            st.error(f"Uploaded file must contain columns: {required_columns}")
+            st.stop()
+
+        # Clean and prepare
+        timer.lap("clean")
+        input_data = state.track("total", ingest.load_frame(uploaded_file, "total"))
+        digest = ingest.file_digest(uploaded_file)
+
+        # Hasil peramalan batch untuk file yang sama, jika sudah dihitung
+        batch_results = pipeline.load_results(digest)
+        if batch_results is not None and 'total' in batch_results:
+            with st.expander(f"Hasil peramalan batch ({batch_results['meta']['created']})"):
+                st.dataframe(batch_results['total'])
+
+        # Dominant year detection
+        dominant_year = int(pd.Series(input_data.index.year).mode()[0])
+        st.info(f"Data terbanyak berasal dari tahun: {dominant_year}")
+
+        # Map model files
+        model_map = {
+            2022: "modelsarima2022",
+            2023: "modelsarima2023",
+            2024: "modelsarima2024"
+        }
+
+        year_options = list(model_map.keys())
+        if dominant_year not in year_options:
+            year_options.append(dominant_year)
+
+        selected_year = st.selectbox(
+            "Pilih tahun model SARIMA (override jika perlu):",
+            options=sorted(year_options),
+            index=year_options.index(dominant_year)
+        )
+
+        MODEL_FILE = model_map.get(selected_year, f"modelsarima{selected_year}")
+
+        # Visualisasi bulanan
+        timer.lap("monthly_chart")
+        st.subheader("📅 Jumlah Barang per Bulan")
+        monthly_data = cube.aggregate_cube(input_data, key=(digest, "total")).total("M")
+        monthly_df = monthly_data.reset_index().rename(columns={"Jumlah": "Total Jumlah"})
+
+        fig_monthly = px.line(
+            monthly_df,
+            x="Tanggal",
+            y="Total Jumlah",
+            title="Total Jumlah Barang per Bulan",
+            markers=True,
+            hover_data={"Tanggal": "|%B %Y", "Total Jumlah": ":,.0f"}
+        )
+        fig_monthly.update_layout(
+            xaxis_title="Bulan",
+            yaxis_title="Jumlah",
+            hovermode="x unified",
+            dragmode="select",
+            selectdirection="h"
+        )
+        st.plotly_chart(fig_monthly, use_container_width=True)
+
+        # statsmodels baru diimpor setelah ada file, agar halaman terbuka cepat
+        from statsmodels.tsa.stattools import adfuller
+
+        # ADF Test
+        timer.lap("adf_test")
+        st.subheader("Uji Stasioneritas (ADF Test)")
+        adf_result = state.memo("adf_total", digest, lambda: adfuller(input_data["Jumlah"]))
+        st.write(f"ADF Statistic: {adf_result[0]}")
+        st.write(f"p-value: {adf_result[1]}")
+        st.write("Critical Values:")
+        for key, value in adf_result[4].items():
+            st.write(f"   {key}: {value}")
+        if adf_result[1] > 0.05:
+            st.warning("Data tidak stasioner, pertimbangkan differencing!")
+        else:
+            st.success("Data sudah stasioner!")
+
+        # Plot ACF & PACF Interaktif
+        timer.lap("acf_pacf")
+        st.subheader("Plot ACF & PACF")
+        acf_values, pacf_values = correlogram.acf_pacf(input_data["Jumlah"], nlags=40)
+
+        acf_fig = px.bar(
+            x=list(range(len(acf_values))),
+            y=acf_values,
+            labels={'x': 'Lag', 'y': 'ACF'},
+            title="Autocorrelation (ACF)"
+        )
+        acf_fig.update_layout(
+            hovermode="x unified",
+            dragmode="select",
+            selectdirection="h",
+            showlegend=False
+        )
+
+        pacf_fig = px.bar(
+            x=list(range(len(pacf_values))),
+            y=pacf_values,
+            labels={'x': 'Lag', 'y': 'PACF'},
+            title="Partial Autocorrelation (PACF)"
+        )
+        pacf_fig.update_layout(
+            hovermode="x unified",
+            dragmode="select",
+            selectdirection="h",
+            showlegend=False
+        )
+
+        col1, col2 = st.columns(2)
+        with col1:
+            st.plotly_chart(acf_fig, use_container_width=True)
+        with col2:
+            st.plotly_chart(pacf_fig, use_container_width=True)
+
+        bagian_model_dan_peramalan(input_data, MODEL_FILE, selected_year, digest)
+        bagian_backtest(input_data, model_map)
+
+
+    except Exception as e:
+        st.error(f"Terjadi kesalahan saat memproses file: {e}")
+
+instrument.render_sidebar(timer)
@@ -0,0 +1,54 @@
+"""Filter-once backtests match refiltering each origin with the same parameters."""
+
+import warnings
+
+import numpy as np
+import pytest
+from statsmodels.tsa.statespace.sarimax import SARIMAX
+
+from forecasting import backtest
+
+SPECS = [
+    dict(order=(1, 1, 1), seasonal_order=(1, 1, 0, 12), enforce_stationarity=False, enforce_invertibility=False),
+    dict(order=(2, 0, 1), seasonal_order=(0, 0, 0, 0), trend="ct"),
+]
+
+
+def _series(n=96, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n)
+    return 5 + 0.02 * t + 0.5 * np.sin(2 * np.pi * t / 12) + rng.normal(scale=0.2, size=n)
+
+
+@pytest.mark.parametrize("init_kwds", SPECS)
+def test_forecast_origins_matches_refiltering(init_kwds):
+    values = _series()
+    params = backtest.estimate_params(values[:48], init_kwds)
+    origins = backtest.rolling_origins(len(values), horizon=6, min_train=48, step=5)
+    predicted = backtest.forecast_origins(values, init_kwds, params, origins, horizon=6)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        expected = np.array([SARIMAX(values[:origin], **init_kwds).filter(params).forecast(6) for origin in origins])
+    np.testing.assert_allclose(predicted, expected, rtol=1e-8, atol=1e-8)
+
+
+def test_metrics_against_direct_computation():
+    values = _series(60, 1)
+    origins = backtest.rolling_origins(len(values), horizon=3, min_train=40)
+    predicted = backtest.forecast_origins(values, SPECS[1], backtest.estimate_params(values[:40], SPECS[1]),
+                                          origins, horizon=3)
+    actual = values[origins[:, None] + np.arange(3)]
+    metrics = backtest.horizon_metrics(actual, predicted, backtest.naive_scales(values, origins))
+
+    errors = actual - predicted
+    scales = np.array([np.mean(np.abs(np.diff(values[:origin]))) for origin in origins])
+    np.testing.assert_allclose(metrics["RMSE"], np.sqrt((errors ** 2).mean(axis=0)))
+    np.testing.assert_allclose(metrics["MAPE"], 100 * np.abs(errors / actual).mean(axis=0))
+    np.testing.assert_allclose(metrics["MASE"], (np.abs(errors) / scales[:, None]).mean(axis=0))
+
+
+def test_run_backtests_reports_short_series():
+    results = backtest.run_backtests({"pendek": _series(10)}, SPECS[1], horizon=12, max_workers=1)
+    assert results["pendek"]["metrics"] is None
+    assert results["pendek"]["error"]
@@ -0,0 +1,32 @@
+"""The batched ACF/PACF match statsmodels' single-series defaults."""
+
+import numpy as np
+import pytest
+from statsmodels.tsa.stattools import acf, pacf
+
+from forecasting import correlogram
+
+
+def _series(n, seed):
+    rng = np.random.default_rng(seed)
+    values = rng.normal(size=n).cumsum() * 0.1 + rng.poisson(3, size=n)
+    # Sebagian minggu tanpa penjualan, seperti data produk
+    values[rng.random(n) < 0.3] = 0.0
+    return values
+
+
+def test_matches_statsmodels_for_mixed_lengths():
+    series_list = [_series(n, seed) for seed, n in enumerate((156, 90, 41, 300))]
+    for values, (acf_values, pacf_values) in zip(series_list, correlogram.correlograms(series_list, nlags=40)):
+        nlags = min(40, len(values) // 2)
+        np.testing.assert_allclose(acf_values, acf(values, nlags=nlags), atol=1e-10)
+        np.testing.assert_allclose(pacf_values, pacf(values, nlags=nlags), atol=1e-8)
+
+
+@pytest.mark.parametrize("nlags", [1, 12, 52])
+def test_single_series_and_lag_limit(nlags):
+    values = _series(104, 7)
+    acf_values, pacf_values = correlogram.acf_pacf(values, nlags)
+    assert len(acf_values) == len(pacf_values) == nlags + 1
+    np.testing.assert_allclose(acf_values, acf(values, nlags=nlags), atol=1e-10)
+    np.testing.assert_allclose(pacf_values, pacf(values, nlags=nlags), atol=1e-8)
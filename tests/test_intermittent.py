@@ -0,0 +1,70 @@
+"""The vectorised Croston/SBA/TSB recursions match a plain per-product loop."""
+
+import numpy as np
+import pytest
+
+from forecasting import intermittent
+
+
+def _reference(values, method, alpha=intermittent.ALPHA, beta=intermittent.BETA):
+    def forecast():
+        if method == "tsb":
+            return probability * size
+        ratio = size / interval if interval > 0 else 0.0
+        return (1 - alpha / 2) * ratio if method == "sba" else ratio
+
+    size = interval = probability = since = 0.0
+    started, squared = False, []
+    for demand in values:
+        if started:
+            squared.append((demand - forecast()) ** 2)
+        since += 1
+        sold = demand > 0
+        if started:
+            if sold:
+                size += alpha * (demand - size)
+                interval += alpha * (since - interval)
+            probability += beta * (sold - probability)
+        elif sold:
+            size, interval, probability = demand, since, 1.0 / max(since, 1.0)
+        if sold:
+            since, started = 0.0, True
+    if not started:
+        return 0.0, 0.0
+    return forecast(), float(np.sqrt(np.mean(squared))) if squared else 0.0
+
+
+def _weekly(n_products=40, n_weeks=120, seed=0):
+    rng = np.random.default_rng(seed)
+    values = np.where(rng.random((n_products, n_weeks)) < rng.uniform(0.05, 0.9, (n_products, 1)),
+                      rng.poisson(4, (n_products, n_weeks)), 0).astype(float)
+    values[0] = 0.0
+    first = rng.integers(0, n_weeks, n_products)
+    return values, first
+
+
+@pytest.mark.parametrize("method", intermittent.METHODS)
+def test_smooth_matches_scalar_reference(method):
+    values, first = _weekly()
+    forecast, rmse = intermittent.smooth(values, first, method)
+    expected = np.array([_reference(row[start:], method) for row, start in zip(values, first)])
+    np.testing.assert_allclose(forecast, expected[:, 0], rtol=1e-12, atol=1e-12)
+    np.testing.assert_allclose(rmse, expected[:, 1], rtol=1e-12, atol=1e-12)
+
+
+def test_demand_profile_classes():
+    values = np.array([
+        [5, 5, 5, 5, 5, 5, 5, 5],     # tiap minggu, ukuran tetap
+        [1, 9, 2, 12, 1, 8, 3, 10],   # tiap minggu, ukuran bervariasi
+        [0, 0, 4, 0, 0, 4, 0, 4],     # jarang, ukuran tetap
+        [0, 0, 1, 0, 0, 20, 0, 2],    # jarang, ukuran bervariasi
+    ], dtype=float)
+    adi, cv2, kind = intermittent.demand_profile(values)
+    assert list(kind) == ["smooth", "erratic", "intermittent", "lumpy"]
+    np.testing.assert_allclose(adi, [1.0, 1.0, 8 / 3, 8 / 3])
+    assert cv2[0] == 0.0
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        intermittent.smooth(np.zeros((1, 3)), method="ses")